@@ -14,6 +14,7 @@ PROJECT_TAGS: Dict[str, list[str]] = {
     "gamma": ["viz", "ui"],
     "delta": ["ops", "cost"],
 }
+_PROJECT_NAMES_SORTED: tuple[str, ...] = tuple(sorted(PROJECT_TAGS))
 
 
 def main():
@@ -25,9 +26,24 @@ def main():
     )
 
     # Initial state
-    app.state.setdefault("items", [])  # [{id, name, desc}]
-    app.state.setdefault("notes", [])  # [{title, body}]
+    # Handlers close over these lists/sets; they are only mutated in place.
+    items = app.state.setdefault("items", [])  # [{id, name, desc}]
+    item_names = app.state.setdefault("_item_names", set())  # name index over items
+    notes = app.state.setdefault("notes", [])  # [{title, body}]
     app.state.setdefault("color", "indigo")
+    app.state.setdefault("_items_rev", 0)  # bumped whenever items change
+
+    # Rows for the items table, rebuilt only when _items_rev moves
+    items_rows_cache: Dict[str, Any] = {"rev": None, "rows": []}
+
+    def show_items_table(target: App):
+        rev = app.state["_items_rev"]
+        if items_rows_cache["rev"] != rev:
+            items_rows_cache["rev"] = rev
+            items_rows_cache["rows"] = [
+                (it["id"], it["name"], it["description"]) for it in items
+            ]
+        target.table("Items", items_rows_cache["rows"], columns=["ID", "Name", "Description"])
 
     @app.on_start
     def show_intro(app_instance: App):
@@ -38,21 +54,14 @@ def main():
             "Multi-line prompt demo: run /note and submit with Esc+Enter."
         )
         app_instance.write(f"Current color: {app_instance.state.get('color', 'indigo')}")
-        items = app_instance.state.get("items", [])
-        notes = app_instance.state.get("notes", [])
         if not items:
             app_instance.info("No items yet. Use /add to create one!")
         else:
-            rows = [
-                {"ID": it["id"], "Name": it["name"], "Description": it["description"]}
-                for it in items
-            ]
-            app_instance.table("Items", rows, columns=["ID", "Name", "Description"])
+            show_items_table(app_instance)
         if notes:
-            note_rows = [
-                {"Title": it["title"], "Body": it["body"].splitlines()[0][:40]}
-                for it in notes
-            ]
+            note_rows = (
+                (it["title"], it["body"].partition("\n")[0][:40]) for it in notes
+            )
             app_instance.table("Notes", note_rows, columns=["Title", "Body"])
 
     # --- Commands demonstrating providers and typed args ---
@@ -63,49 +72,53 @@ def main():
     )
     def add(name: str, description: str = "No description"):
         """Add a new item with an optional description"""
-        items = app.state["items"]
-        if any(i["name"] == name for i in items):
+        if name in item_names:
             app.err(f"Item '{name}' already exists!"); return
         items.append({"id": len(items) + 1, "name": name, "description": description})
+        item_names.add(name)
+        app.state["_items_rev"] += 1
         app.ok(f"Added '{name}'")
 
 
     @app.command("/list", args=[])
-    def list():
+    def list_items():
         """List all items"""
-        items = app.state["items"]
-        rows = [
-            {"ID": it["id"], "Name": it["name"], "Description": it["description"]}
-            for it in items
-        ]
-        app.table("Items", rows, columns=["ID", "Name", "Description"])
+        show_items_table(app)
+
 
+    def complete_item_names(ctx: Dict[str, Any]):
+        prefix = ctx.get("prefix", "")
+        for item in ctx.get("state", {}).get("items", []):
+            if item["name"].startswith(prefix):
+                yield item["name"]
 
-    @app.command("/set",args=[Arg("name", str, completer=lambda ctx: [i["name"] for i in ctx.get("state", {}).get("items", [])], prompt=True),
+    @app.command("/set",args=[Arg("name", str, completer=complete_item_names, prompt=True),
     Arg("description", str, prompt=True),   
     ])
-    def set(name: str, description: str):
+    def set_description(name: str, description: str):
         """Set the description of an existing item"""
-        items = app.state["items"]
         for item in items:
             if item["name"] == name:
                 item["description"] = description
+                app.state["_items_rev"] += 1
                 app.ok(f"Set description of '{name}' to '{description}'")
                 return
         app.err(f"Item '{name}' not found!")
 
     @app.command(
         "/delete",
-        args=[Arg("name", str, completer=lambda ctx: [i["name"] for i in ctx.get("state", {}).get("items", [])], prompt=True)],
+        args=[Arg("name", str, completer=complete_item_names, prompt=True)],
     )
     def delete(name: str):
         """Delete an existing item by name (live completions)"""
-        items = app.state["items"]
-        filtered = [i for i in items if i["name"] != name]
-        if len(filtered) == len(items):
-            app.err(f"Item '{name}' not found!"); return
-        items[:] = filtered
-        app.ok(f"Deleted '{name}'")
+        for idx, item in enumerate(items):
+            if item["name"] == name:
+                del items[idx]
+                item_names.discard(name)
+                app.state["_items_rev"] += 1
+                app.ok(f"Deleted '{name}'")
+                return
+        app.err(f"Item '{name}' not found!")
 
     # History + number-range
     @app.command(
@@ -135,13 +148,8 @@ def main():
         app.state["color"] = color
         app.ok(f"Color set to: {color}")
         app.write(f"Current color: {color}")
-        items = app.state.get("items", [])
         if items:
-            rows = [
-                {"ID": it["id"], "Name": it["name"], "Description": it["description"]}
-                for it in items
-            ]
-            app.table("Items", rows, columns=["ID", "Name", "Description"])
+            show_items_table(app)
         else:
             app.info("No items yet. Use /add to create one!")
 
@@ -163,7 +171,6 @@ def main():
     )
     def note(title: str, body: str):
         """Capture a multi-line note (submit prompt with Esc+Enter)"""
-        notes = app.state.setdefault("notes", [])
         notes[:] = [n for n in notes if n["title"] != title]
         notes.append({"title": title, "body": body})
         app.ok(f"Saved note '{title}' with {len(body.splitlines())} line(s)")
@@ -171,15 +178,20 @@ def main():
 
     # Dataset + Dependent
     def fetch_projects(ctx: Dict[str, Any]):
-        return sorted(PROJECT_TAGS.keys())
+        return _PROJECT_NAMES_SORTED
 
     def fetch_tags(project: str, ctx: Dict[str, Any]):
-        return PROJECT_TAGS.get(project, ["general"]) if project else []
+        if not project:
+            return
+        prefix = ctx.get("prefix", "")
+        for tag in PROJECT_TAGS.get(project, ["general"]):
+            if tag.startswith(prefix):
+                yield tag
 
     @app.command(
         "/label",
         args=[
-            Arg("project", str, completer=lambda ctx: sorted(PROJECT_TAGS.keys())),
+            Arg("project", str, completer=lambda ctx: _PROJECT_NAMES_SORTED),
             Arg("tag", str, completer=completers.dependent("project", fetch_tags)),
         ],
     )
@@ -192,12 +204,12 @@ def main():
     def show_help():
         """List available commands with one-line help"""
         lines = ["Available commands:"]
-        for name, (_, help_text, _) in sorted(app.registry.items(), key=lambda x: x[0]):
-            lines.append(f"  {name} — {help_text}")
+        for name, entry in app.registry.sorted_items():
+            lines.append(f"  {name} — {entry.help_text}")
         lines.append("  /help — List commands")
         app.ok("\n".join(lines))
 
-    app.run()
+    app.run_sync()
 
 
 if __name__ == "__main__":
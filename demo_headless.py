@@ -2,8 +2,10 @@
 """Demonstration of headless mode functionality."""
 
 import argparse
+import asyncio
 import pathlib
 import json
+from array import array
 from typing import Optional
 
 from tui.app import App, Arg, Opt, Path
@@ -24,7 +26,13 @@ def create_demo_app(headless: bool = False,
     )
     
     # Initialize state
-    app.state.setdefault("items", [])
+    # Items are stored column-wise (one container per field) so bulk scripted
+    # adds don't allocate a dict per item. Handlers close over these and only
+    # mutate them in place.
+    item_ids = app.state.setdefault("item_ids", array("i"))
+    item_names = app.state.setdefault("item_names", [])
+    item_descriptions = app.state.setdefault("item_descriptions", [])
+    name_index = app.state.setdefault("_item_names", set())
     
     @app.command("/add", args=[
         Arg("name", str, history=True, prompt=True),
@@ -32,30 +40,26 @@ def create_demo_app(headless: bool = False,
     ])
     def add_item(name: str, description: str = "No description"):
         """Add a new item to the list"""
-        items = app.state["items"]
-        if any(item["name"] == name for item in items):
+        if name in name_index:
             app.err(f"Item '{name}' already exists!")
             return
         
-        new_item = {
-            "id": len(items) + 1,
-            "name": name,
-            "description": description
-        }
-        items.append(new_item)
+        item_ids.append(len(item_ids) + 1)
+        item_names.append(name)
+        item_descriptions.append(description)
+        name_index.add(name)
         app.ok(f"Added item '{name}'")
     
     @app.command("/list", args=[])
     def list_items():
         """List all items"""
-        items = app.state["items"]
-        if not items:
+        if not item_ids:
             app.info("No items yet")
             return
         
         app.table(
             "Items",
-            items,
+            zip(item_ids, item_names, item_descriptions),
             columns=["id", "name", "description"]
         )
     
@@ -65,35 +69,35 @@ def create_demo_app(headless: bool = False,
     ])
     def update_item(name: str, description: str):
         """Update an item's description"""
-        items = app.state["items"]
-        for item in items:
-            if item["name"] == name:
-                old_desc = item["description"]
-                item["description"] = description
-                app.ok(f"Updated '{name}' description from '{old_desc}' to '{description}'")
-                return
-        app.err(f"Item '{name}' not found!")
+        if name not in name_index:
+            app.err(f"Item '{name}' not found!")
+            return
+        idx = item_names.index(name)
+        old_desc = item_descriptions[idx]
+        item_descriptions[idx] = description
+        app.ok(f"Updated '{name}' description from '{old_desc}' to '{description}'")
     
     @app.command("/delete", args=[Arg("name", str, prompt=True)])
     def delete_item(name: str):
         """Delete an item"""
-        items = app.state["items"]
-        original_count = len(items)
-        app.state["items"] = [item for item in items if item["name"] != name]
-        
-        if len(app.state["items"]) < original_count:
-            app.ok(f"Deleted item '{name}'")
-        else:
+        if name not in name_index:
             app.err(f"Item '{name}' not found!")
+            return
+        idx = item_names.index(name)
+        del item_ids[idx]
+        del item_names[idx]
+        del item_descriptions[idx]
+        name_index.discard(name)
+        app.ok(f"Deleted item '{name}'")
     
     @app.command("/stats", args=[])
     def show_stats():
         """Show statistics"""
-        items = app.state["items"]
+        count = len(item_ids)
         app.markdown(f"### Statistics")
-        app.write(f"Total items: {len(items)}")
-        if items:
-            avg_desc_length = sum(len(item["description"]) for item in items) / len(items)
+        app.write(f"Total items: {count}")
+        if count:
+            avg_desc_length = sum(len(desc) for desc in item_descriptions) / count
             app.write(f"Average description length: {avg_desc_length:.1f} characters")
     
     return app
@@ -166,21 +170,21 @@ def main():
     # Run based on mode
     if args.script:
         # Run from script file
-        app.run_script(
+        asyncio.run(app.run_script(
             args.script,
             prompt_responses=prompt_responses,
             fail_on_error=args.fail_fast
-        )
+        ))
     elif args.commands:
         # Run specific commands
-        app.run_script(
+        asyncio.run(app.run_script(
             args.commands,
             prompt_responses=prompt_responses,
             fail_on_error=args.fail_fast
-        )
+        ))
     else:
         # Interactive mode
-        app.run()
+        app.run_sync()
 
 
 if __name__ == "__main__":
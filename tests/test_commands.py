@@ -1,3 +1,4 @@
+import asyncio
 import os
 from typing import Any, Dict, List, Optional
 
@@ -104,3 +105,37 @@ def test_dispatch_handles_quoted_arguments(tmp_path):
     dispatch(app.registry, '/say "hello world"')
 
     assert calls == ["hello world"]
+
+
+def test_dispatch_unquoted_line_matches_shlex(tmp_path):
+    app = make_app(tmp_path)
+
+    calls: List[Any] = []
+
+    @app.command("/pair", args=[Arg("a", str), Opt("b", str, default="")])
+    def pair(a: str, b: str = ""):
+        calls.append((a, b))
+
+    asyncio.run(dispatch(app.registry, "  /pair   one\t--b=two  "))
+    asyncio.run(dispatch(app.registry, "/pair 'one' --b \"two\""))
+    # Only shlex's own whitespace separates words; \xa0 stays inside one
+    asyncio.run(dispatch(app.registry, "/pair foo\xa0bar"))
+
+    assert calls == [("one", "two"), ("one", "two"), ("foo\xa0bar", "")]
+
+
+def test_simple_positional_fast_path_matches_full_parse(tmp_path):
+    app = make_app(tmp_path)
+
+    @app.command("/calc", args=[Arg("a", int), Arg("b", int)])
+    def calc(a: int, b: int):
+        pass
+
+    spec = app.registry.resolve("/calc").spec
+    assert spec.simple_positional
+
+    errors: List[str] = []
+    assert asyncio.run(spec.parse(["1", "2"], on_error=errors.append)) == {"a": 1, "b": 2}
+    assert asyncio.run(spec.parse(["x", "2"], on_error=errors.append)) is None
+    assert asyncio.run(spec.parse(["--c", "2"], on_error=errors.append)) is None
+    assert errors == ["Invalid value for a", "Unknown option: --c"]
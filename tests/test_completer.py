@@ -81,4 +81,66 @@ def test_number_range_completion(tmp_path):
 
     # After entering first arg and a space, now completing b
     b_vals = list(comp.get_completions(DummyDoc("/calc 5 "), None))
-    assert {c.text for c in b_vals} == {"0", "5", "10"}
\ No newline at end of file
+    assert {c.text for c in b_vals} == {"0", "5", "10"}
+
+def test_command_name_completion_is_sorted_prefix_match(tmp_path):
+    app = App("comp_names", append_only=True)
+
+    for name in ["/list", "/delete", "/label", "/add"]:
+        app.command(name, args=[])(lambda: None)
+
+    comp = SlashCompleter(app.registry, history_store=app.history, state_provider=lambda: app.state)
+
+    names = [c.text for c in comp.get_completions(DummyDoc("/l"), None)]
+    assert names == ["/label", "/list"]
+
+    names = [c.text for c in comp.get_completions(DummyDoc("/"), None)]
+    assert names == ["/add", "/delete", "/label", "/list"]
+
+
+def test_no_completions_with_cursor_inside_word(tmp_path):
+    app = App("comp_mid", append_only=True)
+
+    @app.command("/color", args=[Arg("color", str, completer=completers.choices("red", "green"))])
+    def color(color: str):
+        pass
+
+    comp = SlashCompleter(app.registry, history_store=app.history, state_provider=lambda: app.state)
+
+    doc = DummyDoc("/color gr")
+    doc.text_after_cursor = "een"
+    assert list(comp.get_completions(doc, None)) == []
+
+    doc.text_after_cursor = ""
+    assert [c.text for c in comp.get_completions(doc, None)] == ["green"]
+
+
+def test_argument_completions_cached_until_invalidated(tmp_path):
+    app = App("comp_cache", append_only=True)
+    calls = []
+
+    def fetch(ctx: Dict[str, Any]):
+        calls.append(ctx["prefix"])
+        return ["one", "two"]
+
+    @app.command("/pick", args=[Arg("value", str, completer=fetch)])
+    def pick(value: str):
+        pass
+
+    comp = SlashCompleter(app.registry, history_store=app.history, state_provider=lambda: app.state, cache_ttl=60)
+
+    first = [c.text for c in comp.get_completions(DummyDoc("/pick "), None)]
+    second = [c.text for c in comp.get_completions(DummyDoc("/pick "), None)]
+    assert first == second == ["one", "two"]
+    assert len(calls) == 1
+
+    comp.invalidate()
+    list(comp.get_completions(DummyDoc("/pick "), None))
+    assert len(calls) == 2
+
+
+def test_choices_keep_declaration_order():
+    comp = completers.choices("low", "medium", "high", "lowest")
+    assert comp({"prefix": ""}) == ["low", "medium", "high", "lowest"]
+    assert comp({"prefix": "lo"}) == ["low", "lowest"]
+    assert comp({"prefix": "x"}) == []
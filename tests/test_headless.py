@@ -175,4 +175,101 @@ def test_script_from_file(tmp_path):
     assert "✓ second" in content
     assert "✓ third" in content
     # Comments should not be executed
-    assert "# This is a comment" not in content
\ No newline at end of file
+    assert "# This is a comment" not in content
+
+def test_headless_without_transcript_path_skips_recorder(tmp_path, monkeypatch):
+    """Scripted runs with no transcript path never build a recorder."""
+    import asyncio
+    import tui.app as appmod
+
+    def fail(*args, **kwargs):
+        raise AssertionError("TranscriptRecorder should not be constructed")
+
+    monkeypatch.setattr(appmod, "TranscriptRecorder", fail)
+
+    app = App("test_no_transcript", headless=True)
+    assert app.transcript is None
+
+    collected = []
+
+    @app.command("/echo", args=[Arg("msg", str)])
+    def echo(msg: str):
+        collected.append(msg)
+        app.ok(msg)
+
+    asyncio.run(app.run_script(["/echo one", "/echo two"]))
+    assert collected == ["one", "two"]
+
+
+def test_json_transcript_keeps_tuple_table_rows_as_objects(tmp_path):
+    """Tuple rows are recorded keyed by column, like dict rows."""
+    import asyncio
+
+    transcript_path = tmp_path / "transcript.json"
+    app = App("test_tuple_rows", headless=True, transcript_path=transcript_path,
+              transcript_format="json")
+
+    @app.command("/list", args=[])
+    def list_items():
+        app.table("Items", zip([1, 2], ["foo", "bar"]), columns=["id", "name"])
+
+    asyncio.run(app.run_script(["/list"]))
+
+    data = json.loads(transcript_path.read_text())
+    table = data["entries"][0]["outputs"][0]["data"]
+    assert table["rows"] == [{"id": 1, "name": "foo"}, {"id": 2, "name": "bar"}]
+
+
+def test_plain_script_run_renders_after_each_command(tmp_path, capsys):
+    """Hook-free scripted runs still draw each command's output as it finishes."""
+    import asyncio
+
+    app = App("test_plain_render", headless=True)
+    queued = []
+
+    @app.command("/echo", args=[Arg("msg", str)])
+    def echo(msg: str):
+        queued.append(len(app.state.get("__print_queue__") or ()))
+        app.ok(msg)
+
+    asyncio.run(app.run_script(["/echo one", "/echo two", "/echo three"]))
+    assert queued == [0, 0, 0]
+    out = capsys.readouterr().out
+    assert "one" in out and "three" in out
+
+
+def test_transcript_records_while_detached_buffer_is_written(tmp_path):
+    """Records made during a worker-thread write land after the detached bytes."""
+    path = tmp_path / "transcript.md"
+    recorder = TranscriptRecorder(path, buffer_size=256)
+    recorder.record_output("ok", "first " + "y" * 80)  # header + this fill half
+
+    data = recorder.detach_buffer()
+    assert data is not None
+    recorder.record_output("ok", "second " + "x" * 300)  # larger than the buffer
+    recorder.write_detached(data)
+    recorder.finalize()
+
+    content = path.read_text()
+    assert content.index("✓ first") < content.index("✓ second")
+
+
+def test_transcript_entries_are_timestamped_when_recorded(tmp_path):
+    recorder = TranscriptRecorder(tmp_path / "transcript.md")
+    recorder.record_command("/one")
+    assert recorder.entries[0]["timestamp"] >= recorder.start_time.isoformat()
+    recorder.finalize()
+
+
+def test_markdown_transcript_prefixes(tmp_path):
+    path = tmp_path / "transcript.md"
+    with TranscriptRecorder(path) as recorder:
+        recorder.record_command("/greet")
+        recorder.record_output("ok", "done")
+        recorder.record_output("err", "bad")
+        recorder.record_output("other", "plain")
+        recorder.record_prompt_response("Enter name", "Ünïcode")
+
+    content = path.read_text(encoding="utf-8")
+    assert content.startswith("# TUI Session Transcript\nStarted: ")
+    assert "## Command: /greet\n> /greet\n✓ done\n❌ Error: bad\nplain\n🔤 Enter name: Ünïcode\n" in content
@@ -44,3 +44,50 @@ def test_unknown_flag_and_missing_value_errors(tmp_path, monkeypatch):
 
     entry.handler(["Foo", "--hours"])  # missing value for an unknown flag
     assert any("Unknown option: --hours" in e or "requires a value" in e for e in errors)
+
+
+def test_history_log_appends_and_compacts(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from tui.history import COMPACT_RATIO, HistoryStore
+
+    store = HistoryStore("hist_log")
+    store.add("/task", "name", "Foo")
+    store.add("/task", "name", "Bar")
+    store.flush()
+    assert len(store.path.read_text().splitlines()) == 2
+
+    for _ in range(COMPACT_RATIO * 2):
+        store.add("/task", "name", "Foo")
+    store.flush()
+    assert len(store.path.read_text().splitlines()) <= COMPACT_RATIO * 2
+
+    reloaded = HistoryStore("hist_log")
+    assert reloaded.get("/task", "name") == ["Foo", "Bar"]
+
+
+def test_history_tolerates_corrupt_files(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from tui.history import HistoryStore
+
+    app_dir = tmp_path / ".hist_bad"
+    app_dir.mkdir()
+    (app_dir / "history.json").write_text("[1, 2, 3]")
+    assert HistoryStore("hist_bad").get("/task", "name") == []
+
+    (app_dir / "history.jsonl").write_bytes(
+        b'\xff\xfe garbage\n{"c":"/task","a":"name","v":"Foo","t":1}\n'
+    )
+    assert HistoryStore("hist_bad").get("/task", "name") == ["Foo"]
+
+
+def test_history_writer_survives_bad_batches(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    import tui.history as history_mod
+
+    store = history_mod.HistoryStore("hist_writer")
+    history_mod._enqueue(store.path, "append", None)  # not a str: write raises TypeError
+    assert store.flush(timeout=5)
+
+    store.add("/task", "name", "Foo")
+    assert store.flush(timeout=5)
+    assert '"v":"Foo"' in store.path.read_text()
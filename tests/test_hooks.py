@@ -1,3 +1,4 @@
+import asyncio
 import itertools
 
 import tui.app as appmod
@@ -33,9 +34,12 @@ def test_hooks_run_in_order(monkeypatch, tmp_path, capsys):
         def prompt(self, *args, **kwargs):
             return next(self._inputs)
 
+        async def prompt_async(self, *args, **kwargs):
+            return next(self._inputs)
+
     monkeypatch.setattr(appmod, "PromptSession", lambda *a, **k: DummySession())
 
-    app.run()
+    asyncio.run(app.run())
 
     # Drain any buffered output (not needed for assertions, but keeps capsys clean)
     capsys.readouterr()
@@ -16,3 +16,23 @@ def test_print_queue_drains_and_renders(tmp_path, capsys):
     assert "Hello" in out and "World" in out and "Items" in out
     # Queue should be empty now
     assert not app.state.get("__print_queue__")
+
+
+def test_render_swaps_queue_and_skips_when_empty(tmp_path, capsys):
+    app = App("queue_swap", append_only=True)
+
+    app.text("First")
+    drained = app.state["__print_queue__"]
+    app._render()
+    capsys.readouterr()
+
+    # The drained queue is handed off, not copied; new output starts a fresh one
+    app.text("Second")
+    assert app.state["__print_queue__"] is not drained
+
+    app._render()
+    assert "Second" in capsys.readouterr().out
+
+    # Nothing queued: render is a no-op
+    app._render()
+    assert capsys.readouterr().out == ""
@@ -1,3 +1,5 @@
+import pytest
+
 from tui.app import App
 
 
@@ -34,3 +36,36 @@ def test_non_append_only_clears_and_shows_hint(tmp_path, capsys, monkeypatch):
     assert "Type '/' for commands" in out
     assert "Hello" in out
     assert not app.state.get("__print_queue__")
+
+
+def test_table_accepts_generator_of_tuples(tmp_path, capsys):
+    app = App("tuple_rows", append_only=True)
+
+    items = [(1, "Foo"), (2, "Bar")]
+    app.table("Items", (row for row in items), columns=["ID", "Name"])
+
+    app._render()
+    out = capsys.readouterr().out
+    assert "Foo" in out and "Bar" in out
+
+
+def test_table_tuple_rows_without_columns_rejected(tmp_path, capsys):
+    app = App("tuple_rows_no_cols", append_only=True)
+    app.write("kept")
+
+    with pytest.raises(ValueError):
+        app.table("Items", [(1, "Foo")])
+
+    app._render()
+    assert "kept" in capsys.readouterr().out
+
+
+def test_quiet_console_drains_queue_without_output(tmp_path, capsys):
+    app = App("quiet_render", append_only=True)
+    app.console.quiet = True
+
+    app.table("Items", [{"ID": 1, "Name": "X"}])
+
+    app._render()
+    assert capsys.readouterr().out == ""
+    assert not app.state.get("__print_queue__")
@@ -2,13 +2,13 @@ __version__ = "3.0.0"
 
 from .app import App, Arg, Opt, Path
 from .ui import UI, Header, Subheader, Markdown, Text, TableEl
-from .messages import info, ok, warn, err
+from .messages import info, ok, warn, err, bulk_print
 from .theme import INDIGO, ACCENT, GRAY
 
 __all__ = [
     "App", "Arg", "Opt", "Path",
     "UI", "Header", "Subheader", "Markdown", "Text", "TableEl",
-    "info", "ok", "warn", "err",
+    "info", "ok", "warn", "err", "bulk_print",
     "INDIGO", "ACCENT", "GRAY",
     "__version__",
 ]
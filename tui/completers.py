@@ -1,18 +1,52 @@
 """Simple function-based completers for command arguments."""
 from __future__ import annotations
-from typing import List, Callable, Any, Dict
+import os
+from bisect import bisect_left
+from functools import lru_cache
+from typing import List, Callable, Any, Dict, Iterable, Iterator, Sequence, Tuple
 from pathlib import Path
 
 
+def _prefix_bounds(sorted_items: Sequence[str], prefix: str) -> Tuple[int, int]:
+    """Return the slice bounds of the items of a sorted sequence that start with ``prefix``."""
+    lo = bisect_left(sorted_items, prefix)
+    hi = lo
+    n = len(sorted_items)
+    while hi < n and sorted_items[hi].startswith(prefix):
+        hi += 1
+    return lo, hi
+
+
+def _prefix_range(sorted_items: Sequence[str], prefix: str) -> List[str]:
+    """Return the items of a sorted sequence that start with ``prefix``."""
+    lo, hi = _prefix_bounds(sorted_items, prefix)
+    return list(sorted_items[lo:hi])
+
+
+@lru_cache(maxsize=128)
 def choices(*items: str) -> Callable[[Dict[str, Any]], List[str]]:
-    """Complete from a fixed list of choices."""
-    return lambda ctx: [item for item in items if item.startswith(ctx.get("prefix", ""))]
+    """Complete from a fixed list of choices, in declaration order."""
+    # Item positions sorted by item text: bisect finds the prefix run, and
+    # sorting the run's positions restores declaration order
+    order = sorted(range(len(items)), key=items.__getitem__)
+    lexical = [items[i] for i in order]
+
+    def completer(ctx: Dict[str, Any]) -> List[str]:
+        prefix = ctx.get("prefix", "")
+        if not prefix:
+            return list(items)
+        lo, hi = _prefix_bounds(lexical, prefix)
+        return [items[i] for i in sorted(order[lo:hi])]
+    return completer
 
 
 
 
 def paths(extensions: List[str] = None) -> Callable[[Dict[str, Any]], List[str]]:
     """Complete file paths, optionally filtered by extensions."""
+    # str.endswith takes a tuple, so the filter is a single C-level call
+    ext_tuple = tuple(extensions) if extensions else None
+
     def completer(ctx: Dict[str, Any]) -> List[str]:
         prefix = ctx.get("prefix", "")
         base_path = Path(prefix or ".")
@@ -24,20 +58,22 @@ def paths(extensions: List[str] = None) -> Callable[[Dict[str, Any]], List[str]]
             parent = base_path.parent
             prefix_to_match = base_path.name
         
+        base = str(parent)
+        # Match str(parent / name): no "./" for the cwd, no doubled root slash
+        head = "" if base == "." else (base if base.endswith(os.sep) else base + os.sep)
         results = []
         try:
-            for path in parent.iterdir():
-                name = path.name
-                if name.startswith(prefix_to_match):
-                    # Add trailing slash for directories
-                    display = str(path) + ("/" if path.is_dir() else "")
-                    
+            # DirEntry type checks reuse readdir data instead of a stat per call
+            with os.scandir(parent) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not name.startswith(prefix_to_match):
+                        continue
                     # Filter by extensions if provided
-                    if extensions and path.is_file():
-                        if not any(name.endswith(ext) for ext in extensions):
-                            continue
-                    
-                    results.append(display)
+                    if ext_tuple and not name.endswith(ext_tuple) and entry.is_file():
+                        continue
+                    # Add trailing slash for directories
+                    results.append(head + name + ("/" if entry.is_dir() else ""))
         except (OSError, PermissionError):
             pass
         
@@ -62,22 +98,25 @@ def history(limit: int = 10) -> Callable[[Dict[str, Any]], List[str]]:
     return completer
 
 
-def numbers(start: int = 0, stop: int = 100, step: int = 10) -> Callable[[Dict[str, Any]], List[str]]:
-    """Complete with numeric values in a range."""
-    def completer(ctx: Dict[str, Any]) -> List[str]:
+@lru_cache(maxsize=128)
+def numbers(start: int = 0, stop: int = 100, step: int = 10) -> Callable[[Dict[str, Any]], Iterable[str]]:
+    """Complete with numeric values in a range, in range order."""
+    values = tuple(str(n) for n in range(start, stop + 1, step))
+    # Lexicographic copy for bisect; matches are put back in range order
+    lexical = tuple(sorted(values))
+    position = {s: i for i, s in enumerate(values)}
+
+    def completer(ctx: Dict[str, Any]) -> Iterable[str]:
         prefix = ctx.get("prefix", "")
-        results = []
-        for n in range(start, stop + 1, step):
-            s = str(n)
-            if s.startswith(prefix):
-                results.append(s)
-        return results
+        if not prefix:
+            return values
+        return sorted(_prefix_range(lexical, prefix), key=position.__getitem__)
     return completer
 
 
-def dependent(parent_arg: str, fetch: Callable[[str, Dict[str, Any]], List[str]]) -> Callable[[Dict[str, Any]], List[str]]:
+def dependent(parent_arg: str, fetch: Callable[[str, Dict[str, Any]], Iterable[str]]) -> Callable[[Dict[str, Any]], Iterator[str]]:
     """Complete based on the value of another argument."""
-    def completer(ctx: Dict[str, Any]) -> List[str]:
+    def completer(ctx: Dict[str, Any]) -> Iterator[str]:
         prefix = ctx.get("prefix", "")
         arg_values = ctx.get("arg_values") or {}
         parent_value: Any = arg_values.get(parent_arg, "")
@@ -88,7 +127,7 @@ def dependent(parent_arg: str, fetch: Callable[[str, Dict[str, Any]], List[str]]
 
         # Get dependent values
         items = fetch(parent_value, ctx)
-        return [item for item in items if item.startswith(prefix)]
+        return (item for item in items if item.startswith(prefix))
     return completer
 
 
@@ -1,29 +1,171 @@
 from __future__ import annotations
-import json, time, pathlib
-from typing import Dict, List
+import atexit, heapq, json, os, pathlib, queue, threading, time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Rewrite the append-only log once it holds this many lines per live entry
+COMPACT_RATIO = 10
+# Longest flush() (and the exit hook) waits for queued writes, in seconds
+FLUSH_TIMEOUT = 5.0
+
+def _record(command: str, arg: str, value: str, ts: float) -> str:
+    return json.dumps({"c": command, "a": arg, "v": value, "t": ts}, separators=(",", ":")) + "\n"
+
+
+# Disk writes for every store run on one daemon thread fed by this queue;
+# items are (path, "append", line) or (path, "compact", full file text).
+# Nothing here refers back to a store, so stores are freed normally.
+_write_q: "queue.Queue[Tuple[pathlib.Path, str, str]]" = queue.Queue()
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+
+def _enqueue(path: pathlib.Path, op: str, payload: str):
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_writer_loop, name="tui-history", daemon=True)
+                _writer.start()
+                atexit.register(_flush_writes)
+    _write_q.put((path, op, payload))
+
+
+def _flush_writes(timeout: float = FLUSH_TIMEOUT) -> bool:
+    """Wait until every queued history write has reached disk.
+
+    Gives up after ``timeout`` seconds so a stuck disk cannot hang exit;
+    returns whether the queue was drained.
+    """
+    if _writer is None:
+        return True
+    deadline = time.monotonic() + timeout
+    with _write_q.all_tasks_done:
+        while _write_q.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not _writer.is_alive():
+                return False
+            _write_q.all_tasks_done.wait(remaining)
+    return True
+
+
+def _writer_loop():
+    q = _write_q
+    while True:
+        batch = [q.get()]
+        try:
+            while True: batch.append(q.get_nowait())
+        except queue.Empty:
+            pass
+        by_path: Dict[pathlib.Path, List[Tuple[str, str]]] = {}
+        for path, op, payload in batch:
+            by_path.setdefault(path, []).append((op, payload))
+        try:
+            for path, jobs in by_path.items():
+                try:
+                    _write_batch(path, jobs)
+                except Exception:
+                    pass  # history is best-effort; never take the app (or this thread) down
+        finally:
+            for _ in batch: q.task_done()
+
+
+def _write_batch(path: pathlib.Path, batch: List[Tuple[str, str]]):
+    # Created here, off the caller's thread, and only once there is something to write
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pending: List[str] = []
+    for op, payload in batch:
+        if op == "compact":
+            # The snapshot already holds every earlier append
+            pending.clear()
+            tmp = path.with_suffix(".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        else:
+            pending.append(payload)
+    if pending:
+        with path.open("a", encoding="utf-8") as f:
+            f.write("".join(pending))
 
 class HistoryStore:
     def __init__(self, app_id: str = "tui"):
         home = pathlib.Path.home()
-        self.path = home / f".{app_id}" / "history.json"
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.data: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self.path = home / f".{app_id}" / "history.jsonl"
+        self._legacy_path = self.path.with_name("history.json")
+        # (command, arg, value) -> last-used timestamp
+        self.data: Dict[Tuple[str, str, str], float] = {}
+        # (command, arg) -> {value: timestamp}; the candidate set for get()
+        self._index: Dict[Tuple[str, str], Dict[str, float]] = {}
+        # get() results per (command, arg) and limit; add() drops only its own key
+        self._get_cache: Dict[Tuple[str, str], Dict[int, List[str]]] = {}
+        self._lines = 0  # records in the log file
         self._load()
 
     def _load(self):
         if self.path.exists():
-            try: self.data = json.loads(self.path.read_text())
-            except Exception: self.data = {}
+            try:
+                # Undecodable bytes become U+FFFD rather than failing the load
+                with self.path.open(encoding="utf-8", errors="replace") as f:
+                    for line in f:
+                        self._lines += 1
+                        try:
+                            rec: Dict[str, Any] = json.loads(line)
+                            self._set(rec["c"], rec["a"], rec["v"], rec["t"])
+                        except (ValueError, KeyError, TypeError):
+                            continue  # torn or foreign line; dropped on next compaction
+            except OSError:
+                pass  # unreadable history starts empty, like a missing one
+        elif self._legacy_path.exists():
+            # Migrate the pre-JSONL single-document format
+            try: legacy = json.loads(self._legacy_path.read_text())
+            except Exception: legacy = {}
+            # Skip any level that is not the expected nested mapping
+            for command, args in (legacy.items() if isinstance(legacy, dict) else ()):
+                if not isinstance(args, dict):
+                    continue
+                for arg, values in args.items():
+                    if not isinstance(values, dict):
+                        continue
+                    for value, ts in values.items():
+                        self._set(command, arg, value, ts)
+            if self.data:
+                self._compact()
+        self._maybe_compact()
+
+    def _set(self, command: str, arg: str, value: str, ts: float):
+        self.data[(command, arg, value)] = ts
+        self._index.setdefault((command, arg), {})[value] = ts
 
-    def _save(self):
-        self.path.write_text(json.dumps(self.data, indent=2))
+    def _compact(self):
+        _enqueue(self.path, "compact", "".join(
+            _record(command, arg, value, ts)
+            for (command, arg, value), ts in self.data.items()
+        ))
+        self._lines = len(self.data)
+
+    def _maybe_compact(self):
+        if self._lines > COMPACT_RATIO * max(len(self.data), 1):
+            self._compact()
 
     def add(self, command: str, arg: str, value: str):
         now = time.time()
-        self.data.setdefault(command, {}).setdefault(arg, {})[value] = now
-        self._save()
+        self._set(command, arg, value, now)
+        self._get_cache.pop((command, arg), None)
+        _enqueue(self.path, "append", _record(command, arg, value, now))
+        self._lines += 1
+        self._maybe_compact()
+
+    def flush(self, timeout: float = FLUSH_TIMEOUT) -> bool:
+        """Block until queued history writes have reached disk (at most ``timeout`` seconds)."""
+        return _flush_writes(timeout)
 
     def get(self, command: str, arg: str, limit: int = 8) -> List[str]:
-        items = list(self.data.get(command, {}).get(arg, {}).items())
-        items.sort(key=lambda kv: kv[1], reverse=True)
-        return [k for k,_ in items[:limit]]
+        by_limit = self._get_cache.setdefault((command, arg), {})
+        cached = by_limit.get(limit)
+        if cached is None:
+            values = self._index.get((command, arg), {})
+            # Top-k selection; no need to sort the whole history for a few items
+            cached = by_limit[limit] = heapq.nlargest(limit, values, key=values.__getitem__)
+        return list(cached)
@@ -9,6 +9,17 @@ except Exception:  # pragma: no cover
     HTML = None  # type: ignore
 
 
+# Extra prompt() options for multiline input, built once
+_MULTILINE_KW: Dict[str, Any] = {
+    "prompt_continuation": "... ",
+    "bottom_toolbar": (
+        HTML("<b>Esc+Enter</b> submit · Enter newline")
+        if HTML
+        else "Esc+Enter submit · Enter newline"
+    ),
+}
+
+
 class Interaction:
     def ask_text(self, prompt: str, *, default: Optional[str] = None, multiline: bool = False) -> Optional[str]:
         raise NotImplementedError
@@ -86,31 +97,23 @@ class HeadlessInteraction(Interaction):
 class TUIInteraction(Interaction):
     def __init__(self, session: Optional[PromptSession] = None):
         self._session = session or (PromptSession() if PromptSession else None)
+        # Parsed prompt labels, keyed by prompt text
+        self._html_cache: Dict[str, Any] = {}
 
     def ask_text(self, prompt: str, *, default: Optional[str] = None, multiline: bool = False) -> Optional[str]:
         if not self._session:
             return default
         try:
-            prompt_kwargs = {
-                "default": default or "",
-                "multiline": multiline,
-            }
-            if multiline:
-                prompt_kwargs["prompt_continuation"] = "... "
-                toolbar = "Esc+Enter submit · Enter newline"
-                if HTML:
-                    prompt_kwargs["bottom_toolbar"] = HTML(
-                        "<b>Esc+Enter</b> submit · Enter newline"
-                    )
-                else:
-                    prompt_kwargs["bottom_toolbar"] = toolbar
-
+            extra = _MULTILINE_KW if multiline else {}
             if HTML:
-                return self._session.prompt(
-                    HTML(f"<prompt>{prompt}</prompt> "),
-                    **prompt_kwargs
-                ).strip()
-            return self._session.prompt(f"{prompt} ", **prompt_kwargs).strip()
+                message = self._html_cache.get(prompt)
+                if message is None:
+                    message = self._html_cache[prompt] = HTML(f"<prompt>{prompt}</prompt> ")
+            else:
+                message = f"{prompt} "
+            return self._session.prompt(
+                message, default=default or "", multiline=multiline, **extra
+            ).strip()
         except (KeyboardInterrupt, EOFError):
             return None
 
@@ -1,8 +1,22 @@
+from typing import Iterable, Optional, Union
+
 from rich.console import Console
+from rich.style import Style
 from .theme import GRAY
 
 _console = Console()
-def info(t): _console.print(f"[{GRAY}]{t}[/{GRAY}]")
-def ok(t):   _console.print(f"[green]✓ {t}[/green]")
-def warn(t): _console.print(f"[yellow]⚠ {t}[/yellow]")
-def err(t):  _console.print(f"[red]Error: {t}[/red]")
+# Styles are parsed once; printing with style= and markup=False skips
+# re-tokenizing markup on every message.
+_INFO = Style.parse(GRAY)
+_OK = Style.parse("green")
+_WARN = Style.parse("yellow")
+_ERR = Style.parse("red")
+
+def info(t): _console.print(str(t), style=_INFO, markup=False)
+def ok(t):   _console.print(f"✓ {t}", style=_OK, markup=False)
+def warn(t): _console.print(f"⚠ {t}", style=_WARN, markup=False)
+def err(t):  _console.print(f"Error: {t}", style=_ERR, markup=False)
+
+def bulk_print(lines: Iterable[str], style: Optional[Union[str, Style]] = None):
+    """Print many plain lines in a single console render pass."""
+    _console.print("\n".join(map(str, lines)), style=style, markup=False)
@@ -1,43 +1,193 @@
 from __future__ import annotations
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TextIO
+from typing import Any, Dict, List, Optional
 import json
-from rich.console import Console
-from rich.table import Table
-from io import StringIO
+import os
+
+try:  # optional: faster JSON serialization straight to bytes
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def _dumps_entry(obj: Any) -> bytes:
+    """Serialize one transcript entry to UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode("utf-8")
 
 
 class TranscriptRecorder:
     """Records TUI session commands and outputs to create a dribble-like transcript."""
     
-    def __init__(self, output_path: Optional[Path] = None, format: str = "markdown"):
+    def __init__(
+        self,
+        output_path: Optional[Path] = None,
+        format: str = "markdown",
+        buffer_size: int = 65536,
+        keep_entries: bool = False,
+    ):
+        # buffer_size bounds how much encoded output sits in memory (and is
+        # lost on a crash) between flush() calls
         self.output_path = output_path
         self.format = format
+        # Per-command outputs are only held in memory when something reads
+        # them: the JSON writer, or a caller that asked via keep_entries
+        self._keep_entries = format == "json" or keep_entries
         self.entries: List[Dict[str, Any]] = []
         self.start_time = datetime.now()
-        self._file_handle: Optional[TextIO] = None
-        self._console_buffer = StringIO()
-        self._buffered_console = Console(file=self._console_buffer, force_terminal=False)
+        # Raw fd plus our own byte buffer: records are appended as bytes and
+        # handed to os.write in buffer_size chunks, skipping the text and
+        # buffered io layers
+        self._fd: Optional[int] = None
+        self._buf = bytearray()
+        self._buf_limit = buffer_size
+        # Set while a detached buffer is being written by another thread;
+        # records then only accumulate so output stays in order
+        self._detached = False
+        # Fragments of the record being built; written with one write() call
+        self._pending: List[str] = []
+        # JSON mode streams each command entry once the next one starts (it
+        # can still collect outputs until then)
+        self._json_open: Optional[Dict[str, Any]] = None
+        self._json_written = 0
         
+        # Format-specific writers are bound once here instead of re-checking
+        # self.format on every record call; unknown formats write nothing
+        header, on_command, footer = self._FORMAT_WRITERS.get(format, (None, None, None))
+        self._on_command = on_command.__get__(self) if on_command else None
+        self._footer = footer.__get__(self) if footer else None
+
         if self.output_path:
-            self._file_handle = open(self.output_path, "w", encoding="utf-8")
-            self._write_header()
-    
-    def _write_header(self):
-        """Write transcript header based on format."""
-        if self.format == "markdown":
-            self._write(f"# TUI Session Transcript\n")
-            self._write(f"Started: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        elif self.format == "json":
-            # JSON header written at the end
-            pass
-            
+            self._fd = os.open(
+                self.output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644
+            )
+            if header:
+                header(self)
+        else:
+            self._on_command = self._footer = None
+        self._emit_md = self.format == "markdown" and self._fd is not None
+
+    def _md_header(self):
+        started = self.start_time.strftime('%Y-%m-%d %H:%M:%S')
+        self._write_encoded(b"# TUI Session Transcript\nStarted: " + started.encode() + b"\n\n")
+
+    def _md_command(self, entry: Dict[str, Any]):
+        command = entry["command"].encode("utf-8")
+        self._write_encoded(b"## Command: " + command + b"\n> " + command + b"\n")
+
+    def _md_footer(self, end_time: datetime, duration: float):
+        self._write(f"\n---\nSession ended: {end_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self._write(f"Duration: {duration:.2f} seconds\n")
+        self._write(f"Commands executed: {len(self.entries)}\n")
+
+    def _json_header(self):
+        # Entries stream into the array; session metadata closes the object
+        self._write('{"entries": [\n')
+        self._flush_record()
+
+    def _json_command(self, entry: Dict[str, Any]):
+        self._write_json_entry()
+        self._json_open = entry
+
+    def _json_footer(self, end_time: datetime, duration: float):
+        self._write_json_entry()
+        session = {
+            "start_time": self.start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+            "duration_seconds": duration
+        }
+        self._write(f'\n],\n"session": {json.dumps(session, indent=2)}}}\n')
+
+    # format -> (header, command, footer) writers
+    _FORMAT_WRITERS = {
+        "markdown": (_md_header, _md_command, _md_footer),
+        "json": (_json_header, _json_command, _json_footer),
+    }
+
+    # Markdown line prefix per output type, encoded once; anything else is
+    # written bare
+    _OUTPUT_PREFIX = {
+        "ok": "✓ ".encode("utf-8"),
+        "err": "❌ Error: ".encode("utf-8"),
+        "warn": "⚠️  ".encode("utf-8"),
+        "info": "ℹ️  ".encode("utf-8"),
+    }
+    _PROMPT_PREFIX = "🔤 ".encode("utf-8")
+
+    def _write_json_entry(self):
+        """Write the open command entry into the JSON entries array."""
+        entry = self._json_open
+        if entry is None:
+            return
+        self._json_open = None
+        if self._json_written:
+            self._write(",\n")
+        self._flush_record()
+        self._write_encoded(_dumps_entry(entry))
+        self._json_written += 1
+
     def _write(self, content: str):
-        """Write content to transcript file."""
-        if self._file_handle:
-            self._file_handle.write(content)
-            self._file_handle.flush()
+        """Queue content for the current record (written by _flush_record)."""
+        if self._fd is not None:
+            self._pending.append(content)
+
+    def _flush_record(self):
+        """Move the queued fragments of the current record into the byte buffer."""
+        if not self._pending:
+            return
+        data = "".join(self._pending).encode("utf-8")
+        self._pending.clear()
+        self._write_encoded(data)
+
+    def _write_encoded(self, data: bytes):
+        """Append already-encoded bytes to the output buffer."""
+        if self._detached:
+            self._buf += data
+            return
+        if len(data) >= self._buf_limit:
+            # Large records bypass the buffer instead of being copied into it
+            self._flush_buf()
+            self._write_all(data)
+            return
+        self._buf += data
+        if len(self._buf) >= self._buf_limit:
+            self._flush_buf()
+
+    def _flush_buf(self):
+        if self._buf:
+            self._write_all(self._buf)
+            self._buf.clear()
+
+    def _write_all(self, data: bytes | bytearray):
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._fd, view):]
+
+    def flush(self):
+        """Push buffered transcript content to disk."""
+        if self._fd is not None:
+            self._flush_buf()
+
+    def detach_buffer(self) -> Optional[bytearray]:
+        """Take the buffered bytes for write_detached() once they fill half the buffer.
+
+        The buffer is swapped for a fresh one here, on the recording thread,
+        so a worker can write the old one while new records keep arriving.
+        """
+        if self._fd is None or self._detached or len(self._buf) < self._buf_limit // 2:
+            return None
+        data, self._buf = self._buf, bytearray()
+        self._detached = True
+        return data
+
+    def write_detached(self, data: bytearray):
+        """Write a buffer taken by detach_buffer(); safe to call from a worker thread."""
+        try:
+            self._write_all(data)
+        finally:
+            self._detached = False
     
     def record_command(self, command: str):
         """Record a command being executed."""
@@ -49,46 +199,38 @@ class TranscriptRecorder:
         }
         self.entries.append(entry)
         
-        if self.format == "markdown":
-            self._write(f"## Command: {command}\n")
-            self._write(f"> {command}\n")
+        if self._on_command is not None:
+            self._on_command(entry)
     
     def record_output(self, output_type: str, content: str):
         """Record command output (info, ok, warn, err)."""
-        if self.entries and self.entries[-1]["type"] == "command":
+        if self._keep_entries and self.entries and self.entries[-1]["type"] == "command":
             self.entries[-1]["outputs"].append({
                 "type": output_type,
                 "content": content
             })
         
-        if self.format == "markdown":
-            # Format based on output type
-            if output_type == "ok":
-                self._write(f"✓ {content}\n")
-            elif output_type == "err":
-                self._write(f"❌ Error: {content}\n")
-            elif output_type == "warn":
-                self._write(f"⚠️  {content}\n")
-            elif output_type == "info":
-                self._write(f"ℹ️  {content}\n")
-            else:
-                self._write(f"{content}\n")
+        if self._emit_md:
+            self._write_encoded(
+                self._OUTPUT_PREFIX.get(output_type, b"") + f"{content}\n".encode("utf-8")
+            )
     
     def record_ui_element(self, element_type: str, element_data: Dict[str, Any]):
         """Record UI elements like tables, markdown, etc."""
-        if self.entries and self.entries[-1]["type"] == "command":
+        if self._keep_entries and self.entries and self.entries[-1]["type"] == "command":
             self.entries[-1]["outputs"].append({
                 "type": f"ui_{element_type}",
                 "data": element_data
             })
         
-        if self.format == "markdown":
+        if self._emit_md:
             if element_type == "table":
                 self._write_table_markdown(element_data)
             elif element_type == "markdown":
                 self._write(f"\n{element_data.get('content', '')}\n")
             elif element_type == "text":
                 self._write(f"{element_data.get('content', '')}\n")
+            self._flush_record()
     
     def _write_table_markdown(self, table_data: Dict[str, Any]):
         """Convert table data to markdown format."""
@@ -107,53 +249,47 @@ class TranscriptRecorder:
         if not columns and rows:
             columns = list(rows[0].keys())
         
-        # Write header
-        self._write("| " + " | ".join(columns) + " |\n")
-        self._write("|" + "|".join(["-" * (len(col) + 2) for col in columns]) + "|\n")
-        
-        # Write rows
-        for row in rows:
-            values = [str(row.get(col, "")) for col in columns]
-            self._write("| " + " | ".join(values) + " |\n")
-        
-        self._write("\n")
+        # Header, separator and rows go out as a single fragment
+        lines = [
+            "| " + " | ".join(columns) + " |",
+            "|" + "|".join(["-" * (len(col) + 2) for col in columns]) + "|",
+        ]
+        lines.extend(
+            "| " + " | ".join(
+                [str(row.get(col, "")) for col in columns]
+                if isinstance(row, dict)
+                else map(str, row)
+            ) + " |"
+            for row in rows
+        )
+        lines.append("\n")
+        self._write("\n".join(lines))
     
     def record_prompt_response(self, prompt: str, response: str):
         """Record interactive prompt and response."""
-        if self.entries and self.entries[-1]["type"] == "command":
+        if self._keep_entries and self.entries and self.entries[-1]["type"] == "command":
             self.entries[-1]["outputs"].append({
                 "type": "prompt",
                 "prompt": prompt,
                 "response": response
             })
         
-        if self.format == "markdown":
-            self._write(f"🔤 {prompt}: {response}\n")
+        if self._emit_md:
+            self._write_encoded(self._PROMPT_PREFIX + f"{prompt}: {response}\n".encode("utf-8"))
     
     def finalize(self):
         """Finalize the transcript and close the file."""
         end_time = datetime.now()
         duration = (end_time - self.start_time).total_seconds()
         
-        if self.format == "markdown":
-            self._write(f"\n---\nSession ended: {end_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            self._write(f"Duration: {duration:.2f} seconds\n")
-            self._write(f"Commands executed: {len(self.entries)}\n")
-        elif self.format == "json":
-            # Write complete JSON output
-            output = {
-                "session": {
-                    "start_time": self.start_time.isoformat(),
-                    "end_time": end_time.isoformat(),
-                    "duration_seconds": duration
-                },
-                "entries": self.entries
-            }
-            self._write(json.dumps(output, indent=2))
+        if self._footer is not None:
+            self._footer(end_time, duration)
         
-        if self._file_handle:
-            self._file_handle.close()
-            self._file_handle = None
+        if self._fd is not None:
+            self._flush_record()
+            self._flush_buf()
+            os.close(self._fd)
+            self._fd = None
     
     def __enter__(self):
         return self
@@ -1,128 +1,196 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Any, Iterable, List
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from collections.abc import Iterable as IterableABC
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
-from rich.console import Console
+from rich.console import Console, Group, RenderableType
 from rich.panel import Panel
 from rich.table import Table
-from rich.markdown import Markdown as RichMarkdown
 
 from .theme import INDIGO, GRAY
 
+
+def _slotted(cls):
+    """Rebuild a dataclass with ``__slots__``; ``dataclass(slots=True)`` needs 3.10."""
+    names = tuple(f.name for f in fields(cls))
+    ns = {k: v for k, v in cls.__dict__.items() if k not in names + ("__dict__", "__weakref__")}
+    ns["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, ns)
+
+
+@_slotted
 @dataclass
 class Header:
     text: str
 
 
+@_slotted
 @dataclass
 class Subheader:
     text: str
 
 
+@_slotted
 @dataclass
 class Markdown:
     text: str
 
 
+@_slotted
 @dataclass
 class Text:
     text: str
 
 
+@_slotted
 @dataclass
 class TableEl:
     title: str
-    rows: List[dict]
+    rows: List[Any]  # dicts, or tuples ordered like ``columns``
     columns: List[str] | None = None
+    # (name, justify, style) per column, worked out once per instance
+    _col_specs: Tuple[Tuple[str, str, Optional[str]], ...] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self._col_specs = _column_specs(
+            self.columns or (self.rows[0].keys() if self.rows else ())
+        )
 
 
 def UI(*elements: Any) -> List[Any]:
     return [e for e in elements if e is not None]
 
 
-def render_elements(console: Console, elements: Any | Iterable[Any] | None):
-    if elements is None:
-        return
+_RIGHT_JUSTIFIED = frozenset({"id", "count", "value", "amount", "size", "score", "total"})
 
-    def iter_elems(obj):
-        if obj is None:
-            return
-        # Strings are iterable but should be treated as a single element
-        if isinstance(obj, str):
-            yield obj
-            return
-        if isinstance(obj, (list, tuple)):
+
+@lru_cache(maxsize=256)
+def _column_justify(name: str) -> str:
+    """Numeric-looking column names are right-aligned; column names repeat across renders."""
+    return "right" if name.lower() in _RIGHT_JUSTIFIED else "left"
+
+
+def _column_specs(cols: Iterable[str]) -> Tuple[Tuple[str, str, Optional[str]], ...]:
+    """(name, justify, style) per column; the first column is bold."""
+    return tuple(
+        (c, _column_justify(c), "bold" if i == 0 else None) for i, c in enumerate(cols)
+    )
+
+
+def _build_table(title: str, rows: List[dict], specs: Tuple[Tuple[str, str, Optional[str]], ...]) -> Table:
+    """Build the whole Rich table up front so it is emitted with one print."""
+    t = Table(title=title, show_header=True, header_style=INDIGO)
+    cols = [c for c, _, _ in specs]
+    for c, justify, style in specs:
+        t.add_column(c, justify=justify, style=style)
+    for row in rows:
+        if isinstance(row, dict):
+            t.add_row(*[str(row.get(c, "")) for c in cols])
+        else:
+            t.add_row(*[str(v) for v in row])
+    return t
+
+
+def _render_markdown(e: Markdown) -> RenderableType:
+    # rich.markdown pulls in markdown-it; only pay for it once needed
+    from rich.markdown import Markdown as RichMarkdown
+    return Panel.fit(RichMarkdown(e.text), border_style=INDIGO)
+
+
+def _render_table(e: TableEl) -> RenderableType:
+    specs = e._col_specs
+    if not specs and e.rows:
+        # Rows were added after construction; infer the columns now
+        specs = e._col_specs = _column_specs(e.rows[0].keys())
+    return _build_table(e.title, e.rows, specs)
+
+
+# Header markup around the text; the color never changes at runtime
+_HDR_PREFIX = f"[bold][{INDIGO}]"
+_HDR_SUFFIX = f"[/{INDIGO}][/bold]"
+
+
+# Element type -> renderable builder; exact types hit with one dict lookup,
+# subclasses fall back to an isinstance scan in the same order.
+_RENDERERS: Dict[type, Callable[[Any], RenderableType]] = {
+    Header: lambda e: f"{_HDR_PREFIX}{e.text}{_HDR_SUFFIX}",
+    Subheader: lambda e: f"[bold]{e.text}[/bold]",
+    Markdown: _render_markdown,
+    Text: lambda e: e.text,
+    TableEl: _render_table,
+    # Auto-promote plain strings to Markdown panel for nicer formatting
+    str: lambda e: Panel.fit(e, border_style=INDIGO),
+}
+
+
+def _to_renderable(e: Any) -> RenderableType:
+    render = _RENDERERS.get(type(e))
+    if render is not None:
+        return render(e)
+    for cls, render in _RENDERERS.items():
+        if isinstance(e, cls):
+            return render(e)
+    if isinstance(e, (list, tuple)) and e and all(isinstance(x, dict) for x in e):
+        # Auto-render a list of dicts as a table (columns inferred)
+        rows = list(e)
+        return _build_table("", rows, _column_specs(rows[0].keys()))
+    # Fallback: print string representation
+    return str(e)
+
+
+def _iter_elems(obj: Any) -> Iterable[Any]:
+    if obj is None:
+        return
+    # Strings are iterable but should be treated as a single element
+    if isinstance(obj, (str, bytes)):
+        yield obj
+        return
+    if isinstance(obj, (list, tuple)):
+        yield from obj
+        return
+    # Generic iterable (e.g., generator)
+    if isinstance(obj, IterableABC):
+        try:
             for it in obj:
                 yield it
             return
-        # Generic iterable (e.g., generator)
-        if hasattr(obj, "__iter__"):
-            try:
-                for it in obj:
-                    yield it
-                return
-            except TypeError:
-                pass
-        # Fallback: single object
-        yield obj
+        except TypeError:
+            pass
+    # Fallback: single object
+    yield obj
 
-    for e in iter_elems(elements):
-        if e is None:
-            continue
-        if isinstance(e, Header):
-            console.print(f"[bold][{INDIGO}]{e.text}[/{INDIGO}][/bold]")
-        elif isinstance(e, Subheader):
-            console.print(f"[bold]{e.text}[/bold]")
-        elif isinstance(e, Markdown):
-            console.print(Panel.fit(RichMarkdown(e.text), border_style=INDIGO))
-        elif isinstance(e, Text):
-            console.print(e.text)
-        elif isinstance(e, TableEl):
-            cols = e.columns or (list(e.rows[0].keys()) if e.rows else [])
-            t = Table(title=e.title, show_header=True, header_style=INDIGO)
-            for c in cols:
-                justify = "right" if c.lower() in {"id","count","value","amount","size","score","total"} else "left"
-                style = "bold" if c == cols[0] else None
-                t.add_column(c, justify=justify, style=style)
-            for row in e.rows:
-                t.add_row(*[str(row.get(c, "")) for c in cols])
-            console.print(t)
-        elif isinstance(e, str):
-            # Auto-promote plain strings to Markdown panel for nicer formatting
-            console.print(Panel.fit(e, border_style=INDIGO))
-        elif isinstance(e, (list, tuple)) and e and all(isinstance(x, dict) for x in e):
-            # Auto-render a list of dicts as a table (columns inferred)
-            rows = list(e)
-            cols = list(rows[0].keys()) if rows else []
-            t = Table(title="", show_header=True, header_style=INDIGO)
-            for c in cols:
-                justify = "right" if c.lower() in {"id","count","value","amount","size","score","total"} else "left"
-                style = "bold" if c == cols[0] else None
-                t.add_column(c, justify=justify, style=style)
-            for row in rows:
-                t.add_row(*[str(row.get(c, "")) for c in cols])
-            console.print(t)
-        else:
-            # Fallback: print string representation
-            console.print(str(e))
+
+def render_elements(console: Console, elements: Any | Iterable[Any] | None):
+    # A quiet console discards everything; skip building panels and tables
+    if elements is None or console.quiet:
+        return
+    # Collect every renderable first so the batch reaches the terminal in a
+    # single console.print rather than one write per element.
+    renderables = [_to_renderable(e) for e in _iter_elems(elements) if e is not None]
+    if renderables:
+        console.print(Group(*renderables))
+
+# Queue descriptor kind ("k") -> element constructor
+_DESC_CTORS: Dict[str, Callable[[dict], Any]] = {
+    "md": lambda d: Markdown(d.get("t", "")),
+    "text": lambda d: Text(d.get("t", "")),
+    "table": lambda d: TableEl(d.get("title", ""), d.get("rows", []), d.get("cols")),
+    "header": lambda d: Header(d.get("t", "")),
+    "subheader": lambda d: Subheader(d.get("t", "")),
+}
 
 
 def descriptors_to_elements(descs: Iterable[dict]) -> List[Any]:
     out: List[Any] = []
-    for d in descs or []:
-        try:
-            k = d.get("k")
-            if k == "md":
-                out.append(Markdown(d.get("t", "")))
-            elif k == "text":
-                out.append(Text(d.get("t", "")))
-            elif k == "table":
-                out.append(TableEl(d.get("title", ""), d.get("rows", []), d.get("cols")))
-            elif k == "header":
-                out.append(Header(d.get("t", "")))
-            elif k == "subheader":
-                out.append(Subheader(d.get("t", "")))
-        except Exception:
-            # Skip malformed descriptors
+    append = out.append
+    for d in descs or ():
+        # Skip malformed descriptors and unknown kinds
+        if not isinstance(d, dict):
             continue
+        ctor = _DESC_CTORS.get(d.get("k"))
+        if ctor is not None:
+            append(ctor(d))
     return out